@@ -1,72 +1,38 @@
 # app.py
 
 # Import necessary libraries
-from pathlib import Path
-from typing import cast
-
 import panel as pn
-import pandas as pd
-import geopandas as gpd
 
-# Import data loading and preprocessing functions
-from data.loader import load_data
-from data.filters import preprocess, filter_data
+# Import the data pipeline (loaded once per server process)
+from data.pipeline import get_dashboard_data
 
-# Import components for the dashboard
-from components.widgets import create_widgets
-from components.map import create_choropleth_map
-from components.charts.bar_chart_by_year import create_bar_chart_year 
-from components.charts.bar_chart_by_country import create_bar_chart_country
+# Import the session builders (shared figures and pre-built dashboards)
+from layout.session import create_dashboard, get_figure_cache, get_session_pool
 
-# Import the layout builder
-from layout.dashboard import build_layout
+# Import the static map switch and the opt-in profiler
+from components.static_map import use_static_map
+from utils.profiling import profiling_enabled, make_profile_decorator
 
 # Initialize Panel extension with required components
 pn.extension('tabulator', 'plotly', design='material', sizing_mode='stretch_width')
 
-# Load and preprocess data from paths relative to this file
-base_dir = Path(__file__).resolve().parent
-data_paths = [
-    base_dir / 'data' / 'nrg_ind_ren_linear.csv',
-    base_dir / 'data' / 'nrg_ind_ren_linear_old.csv',
-]
-geo_path = base_dir / 'geo' / 'europe.geojson'
-raw_data, raw_europe = load_data(data_path=[str(path) for path in data_paths], geo_path=str(geo_path), return_raw=True)
-data = cast(pd.DataFrame, raw_data)
-europe = cast(gpd.GeoDataFrame, raw_europe)
-# If preprocess expects a DataFrame, convert GeoDataFrame to DataFrame
-merged = preprocess(data, europe)
-if not isinstance(data, pd.DataFrame) or not isinstance(europe, gpd.GeoDataFrame):
-    raise ValueError("load_data did not return expected DataFrame and GeoDataFrame")
-df_renewable, df_eu_total = filter_data(merged)
-
-# Widgets
-year_slider, country_select = create_widgets(df_renewable)
-
-# Bindings / interactive components
-@pn.depends(year_slider.param.value)
-def map_view(year):
-    df_year = df_renewable[df_renewable['Year'] == year]
-    return create_choropleth_map(df_year)
+# Profile callbacks and data loading if enabled (EU_ENERGY_MAP_PROFILE=1 or ?profile=1)
+profiling = profiling_enabled()
+profile = make_profile_decorator(profiling)
 
-@pn.depends(year_slider.param.value)
-def bar_by_year(year):
-    df_year = df_renewable[df_renewable['Year'] == year]
-    return create_bar_chart_year(df_year, year)
+# Load and preprocess the data once; later sessions reuse it.
+# Profiled sessions also profile the loading steps (once per server process).
+data = get_dashboard_data(profile if profiling else None)
 
-@pn.depends(country_select.param.value)
-def bar_by_country(country):
-    df_country = df_renewable[df_renewable['Country'] == country]
-    return create_bar_chart_country(df_eu_total, df_country, country)
+# Static map fallback for clients without WebGL or on slow connections
+static_map_session = use_static_map()
 
-# Create the layout
-template = build_layout(
-    interactive_map=map_view,
-    interactive_bar_year=bar_by_year,
-    interactive_bar_country=bar_by_country,
-    year_slider=year_slider,
-    country_select=country_select
-)
+if static_map_session or profiling:
+    # Sessions with options get a dashboard built for them
+    template = create_dashboard(data, get_figure_cache(data), static_map=static_map_session, profile=profile)
+else:
+    # Default sessions get a dashboard built in advance
+    template = get_session_pool(data).take()
 
 # Serve the application
-template.servable()
\ No newline at end of file
+template.servable()
@@ -0,0 +1,34 @@
+# benchmarks/payload.py
+
+# Measure the JSON payload sent to the browser for each dashboard figure.
+#
+# Run from the project root:
+#     python -m benchmarks.payload
+
+# Import necessary libraries
+from data.pipeline import load_dashboard_data
+from data.store import get_year_slice, get_country_slice
+from components.map import create_choropleth_map
+from components.charts.bar_chart_by_year import create_bar_chart_year
+from components.charts.bar_chart_by_country import create_bar_chart_country
+from components.charts.comparison_chart import create_comparison_chart
+from utils.encoding import figure_payload_size
+
+
+def main(year=2022, country='Germany'):
+    data = load_dashboard_data()
+    store, df_eu_total = data['store'], data['df_eu_total']
+
+    figures = {
+        'map': create_choropleth_map(get_year_slice(store, year)),
+        'bar_by_year': create_bar_chart_year(get_year_slice(store, year), year),
+        'bar_by_country': create_bar_chart_country(df_eu_total, get_country_slice(store, country), country),
+        'comparison (all selected)': create_comparison_chart(store['by_country'], df_eu_total, list(store['by_country'])),
+    }
+    print(f"{'Figure':<28}{'Payload (bytes)':>16}")
+    for name, fig in figures.items():
+        print(f"{name:<28}{figure_payload_size(fig):>16,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+# benchmarks/scaling.py
+
+# Measure how the regional map scales with the number of regions, using
+# synthetic boundaries and data (no NUTS files needed).
+#
+# Run from the project root:
+#     python -m benchmarks.scaling
+#
+# For each size, the stages of the regional view are timed: reading the data
+# (load_indicator), loading the boundaries (load_geojson), building the
+# year x region matrix, building and serializing the first figure, and
+# switching the year (update_regional_map). The year update only sends the
+# new values, so its cost should stay small as the number of regions grows.
+
+# Import necessary libraries
+import json
+import math
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+
+from data.loader import load_indicator
+from data.registry import DatasetSpec
+from data.store import build_region_matrix
+from components.map import load_geojson, get_geojson, create_regional_map, update_regional_map
+from utils.encoding import figure_payload_size
+
+# Numbers of regions (the country map has 259 features, NUTS-2 about 300)
+SIZES = (250, 500, 1000, 2000, 4000)
+# Vertices per region outline (similar to the 1:20M NUTS-2 boundaries)
+VERTICES = 80
+# Years and categories per region in the synthetic dataset
+YEARS = range(1995, 2025)
+CATEGORIES = ('HDD', 'CDD')
+# Repetitions per measurement (the fastest run is reported)
+REPEAT = 3
+
+
+def synthetic_regions(n, vertices=VERTICES):
+    """Return a GeoJSON FeatureCollection of n roughly circular regions on a grid over Europe."""
+    columns = math.ceil(math.sqrt(n * 1.5))
+    rows = math.ceil(n / columns)
+    width, height = 40.0 / columns, 34.0 / rows
+    features = []
+    for i in range(n):
+        lon = -10 + (i % columns + 0.5) * width
+        lat = 36 + (i // columns + 0.5) * height
+        ring = [
+            [lon + 0.45 * width * math.cos(2 * math.pi * k / vertices) * (1 + 0.1 * math.sin(7 * k)),
+             lat + 0.45 * height * math.sin(2 * math.pi * k / vertices) * (1 + 0.1 * math.sin(7 * k))]
+            for k in range(vertices)
+        ]
+        ring.append(ring[0])
+        features.append({
+            'type': 'Feature',
+            'properties': {'NUTS_ID': f'R{i:05d}', 'NAME_LATN': f'Region {i}', 'LEVL_CODE': 2},
+            'geometry': {'type': 'Polygon', 'coordinates': [ring]},
+        })
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def synthetic_data(n, seed=0):
+    """Return a Eurostat-style linear CSV table with one value per region, category and year."""
+    rng = np.random.default_rng(seed)
+    geo = np.repeat([f'R{i:05d}' for i in range(n)], len(CATEGORIES) * len(YEARS))
+    indic = np.tile(np.repeat(CATEGORIES, len(YEARS)), n)
+    years = np.tile(list(YEARS), n * len(CATEGORIES))
+    return pd.DataFrame({
+        'LAST UPDATE': '01/01/25 23:00:00',
+        'indic_nrg': indic,
+        'geo': geo,
+        'TIME_PERIOD': years,
+        'OBS_VALUE': rng.uniform(0, 5000, len(geo)).round(2),
+    })
+
+
+def best_of(func, repeat=REPEAT):
+    """Return (result, fastest run time in milliseconds) of func()."""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+def measure(n, directory):
+    """Measure all stages for n regions, using directory for the synthetic files."""
+    geo_path = directory / f'regions_{n}.geojson'
+    data_path = directory / f'regions_{n}.csv'
+    geojson = synthetic_regions(n)
+    geo_path.write_text(json.dumps(geojson))
+    synthetic_data(n).to_csv(data_path, index=False)
+
+    spec = DatasetSpec(
+        key='synthetic', title='Synthetic regional indicator', files=(str(data_path),), unit='degree days',
+        dimension='indic_nrg', category_label='Indicator', value_label='Degree Days',
+        codes={'HDD': 'Heating degree days', 'CDD': 'Cooling degree days'}, geo_level='nuts2',
+    )
+    geo_df = pd.DataFrame([feature['properties'] for feature in geojson['features']])
+
+    table, ingest_ms = best_of(lambda: load_indicator(spec, geo_df))
+    _, geometry_ms = best_of(lambda: load_geojson.__wrapped__(geo_path, 'NUTS_ID'))
+    load_geojson(geo_path, 'NUTS_ID')
+    heating = table[table['Indicator'] == 'Heating degree days']
+    matrix, matrix_ms = best_of(lambda: build_region_matrix(heating, 'Degree Days'))
+
+    def first_figure():
+        get_geojson.cache_clear()
+        return create_regional_map(matrix, 2024, geo_path, 'Heating degree days', 'degree days')
+
+    fig, figure_ms = best_of(first_figure)
+    payload, serialize_ms = best_of(lambda: pio.to_json(fig, validate=False))
+
+    years = iter(list(YEARS) * REPEAT)
+    _, update_ms = best_of(lambda: update_regional_map(fig, matrix, next(years)))
+    update_payload = len(pio.to_json({'z': fig.data[0].z}, validate=False))
+
+    return {
+        'regions': n,
+        'rows': len(table),
+        'ingest ms': ingest_ms,
+        'geometry ms': geometry_ms,
+        'matrix ms': matrix_ms,
+        'figure ms': figure_ms,
+        'serialize ms': serialize_ms,
+        'first payload KB': figure_payload_size(fig) / 1024,
+        'year update ms': update_ms,
+        'update payload KB': update_payload / 1024,
+    }
+
+
+def main(sizes=SIZES):
+    with tempfile.TemporaryDirectory() as tmp:
+        results = pd.DataFrame([measure(n, Path(tmp)) for n in sizes])
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(results.round(1).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
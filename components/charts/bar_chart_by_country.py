@@ -1,7 +1,9 @@
 # components/charts/bar_chart_by_country.py
 
+import pandas as pd
 import plotly.graph_objects as go
 from utils.colors import get_viridis_color, get_colorscale
+from utils.encoding import compact_template, as_float32, as_int16
 
 # Create bar chart for renewable energy by country
 def create_bar_chart_country(df_eu_total, df_country, country):
@@ -19,6 +21,17 @@ def create_bar_chart_country(df_eu_total, df_country, country):
     # EU total average as a scatter‐line
     eu_avg = df_eu_total['Renewable Percentage'].mean()
     avg_color = get_viridis_color(eu_avg, fmt='hex')
+    # Years as int16 and shares as float32 arrays for a compact payload
+    eu_years, eu_shares = as_int16(df_eu_total['Year']), as_float32(df_eu_total['Renewable Percentage'])
+    country_years, country_shares = as_int16(df_country['Year']), as_float32(df_country['Renewable Percentage'])
+    # Provenance (file and release) of each value, see data/loader.merge_releases
+    sources = df_country['Source'].astype(str).tolist() if 'Source' in df_country else None
+    # Precomputed metrics (see data/analytics.py), shown in the hover if available
+    country_metrics = 'Rolling Average' in df_country and 'Gap to EU 2030 Target' in df_country
+    eu_gap = 'Gap to EU 2030 Target' in df_eu_total
+    # Growth since the first year, shown in the title
+    cagr = df_country['CAGR'].iloc[-1] if 'CAGR' in df_country and len(df_country) else None
+    cagr_text = f"  <i>CAGR {cagr:+.1f}% per year</i>" if pd.notna(cagr) else ""
 
     # Create a Plotly Figure object
     # This will hold both the EU total average line and the country bar chart
@@ -27,8 +40,8 @@ def create_bar_chart_country(df_eu_total, df_country, country):
     # EU total as scatter‐line
     fig.add_trace(go.Scatter(
         # Year on x-axis, Renewable Percentage on y-axis
-        x=df_eu_total['Year'],
-        y=df_eu_total['Renewable Percentage'],
+        x=eu_years,
+        y=eu_shares,
         
         # Use lines and markers for better visibility
         mode='lines+markers',
@@ -39,7 +52,7 @@ def create_bar_chart_country(df_eu_total, df_country, country):
         # Add markers for each data point
         marker=dict(
             size=6, 
-            color=df_eu_total['Renewable Percentage'], 
+            color=eu_shares, 
             colorscale=get_colorscale(), 
             coloraxis="coloraxis"),
         
@@ -48,25 +61,47 @@ def create_bar_chart_country(df_eu_total, df_country, country):
 
         # Custom hover template for EU total
         hovertemplate="Renewable Share: <b>%{y:.1f}%</b><br>"
-                      "Year: <b>%{x}</b>",
+                      "Year: <b>%{x}</b>" +
+                      ("<br>Gap to EU 2030 Target: <b>%{customdata:.1f} pp</b>" if eu_gap else ""),
+        customdata=as_float32(df_eu_total['Gap to EU 2030 Target']) if eu_gap else None,
    
     ))
 
+    # EU share weighted by gross final energy consumption, for the years with consumption data
+    if 'Weighted Percentage' in df_eu_total and df_eu_total['Weighted Percentage'].notna().any():
+        weighted = df_eu_total.dropna(subset=['Weighted Percentage'])
+        fig.add_trace(go.Scatter(
+            x=as_int16(weighted['Year']),
+            y=as_float32(weighted['Weighted Percentage']),
+            mode='lines',
+            # Dotted line in the color of the EU average
+            line=dict(color=avg_color, width=2, dash='dot'),
+            name="<b>EU Weighted Average</b>",
+            hovertemplate="Weighted by Final Energy Consumption: <b>%{y:.1f}%</b><br>"
+                          "Year: <b>%{x}</b>",
+        ))
+
     # Single country as bars
     fig.add_trace(go.Bar(
         # Year on x-axis, Renewable Percentage on y-axis
-        x=df_country['Year'],
-        y=df_country['Renewable Percentage'],
+        x=country_years,
+        y=country_shares,
 
         # Use a color scale for the bars
         marker=dict(
-            color=df_country['Renewable Percentage'],
+            color=country_shares,
             colorscale=get_colorscale(), 
             coloraxis="coloraxis"),
         
         # Custom hover template for country
         hovertemplate="Renewable Share: <b>%{y:.1f}%</b><br>"
-                      "Year: <b>%{x} </b>",
+                      "Year: <b>%{x} </b>" +
+                      ("<br>3-Year Average: <b>%{customdata[0]:.1f}%</b>"
+                       "<br>Gap to EU 2030 Target: <b>%{customdata[1]:.1f} pp</b>" if country_metrics else "") +
+                      ("<br><i>Source: %{hovertext}</i>" if sources else ""),
+        hovertext=sources,
+        # Precomputed metrics as a numeric customdata block
+        customdata=as_float32(df_country[['Rolling Average', 'Gap to EU 2030 Target']]) if country_metrics else None,
         
         # Set the bar trace name as "Country: <b>Name</b> Flag"
         name=f"<b>{df_country['Country'].iloc[0]}</b> {df_country['Flag'].iloc[0]}",
@@ -83,8 +118,10 @@ def create_bar_chart_country(df_eu_total, df_country, country):
     # This will set the title, axis labels, color scale, and other layout properties 
 
     fig.update_layout(
+        # Template with defaults only for the trace types used in this figure
+        template=compact_template('bar', 'scatter'),
         # Set the title of the chart
-        title=f"<b>Share of Renewable Energy ({country}, 2004–2024)</b>",
+        title=f"<b>Share of Renewable Energy ({country}, 2004–2024)</b>{cagr_text}",
         
         # Set x-axis properties
         xaxis=dict(
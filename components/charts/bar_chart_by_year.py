@@ -2,15 +2,20 @@
 
 import plotly.graph_objects as go
 from utils.colors import get_viridis_color, get_colorscale
+from utils.encoding import compact_template
+from data.store import build_year_arrays
 
 # Create bar chart for renewable energy by year
-def create_bar_chart_year(df_year, year):
+def create_bar_chart_year(df_year, year, eu_avg=None, arrays=None):
     """    
     Returns a bar chart showing the share of renewable energy in the EU for a specific year.
     
     Args:
         df_year (DataFrame): DataFrame containing renewable energy data for the specified year.
         year (int): The year for which the bar chart is created.
+        eu_avg (float, optional): Precomputed EU average for the year. Computed from df_year if not given.
+        arrays (dict, optional): Precomputed plot arrays of the year (see data/store.build_year_arrays).
+            Built from df_year if not given.
     
     Returns:
         fig (Figure): A Plotly Figure object containing the bar chart.
@@ -18,10 +23,17 @@ def create_bar_chart_year(df_year, year):
     
     # Prepare the data for the bar chart
 
-    # Sort the DataFrame by Renewable Percentage
-    df_year = df_year.sort_values(by='Renewable Percentage')
-    # Calculate the average renewable percentage for the EU
-    eu_total_avg = df_year['Renewable Percentage'].mean()
+    # Countries sorted by Renewable Percentage, with their labels and metrics
+    if arrays is None:
+        arrays = build_year_arrays(df_year)
+    ranked = arrays['ranked']
+    # Country names are sent once as x values, numbers as float32 arrays
+    countries = ranked['countries']
+    shares = ranked['shares']
+    # Use the precomputed EU average or calculate it from the data
+    if eu_avg is None:
+        eu_avg = float(shares.mean()) if len(shares) else float('nan')
+    eu_total_avg = eu_avg
     # Get a color for the EU average using a utility function
     scaled_color = get_viridis_color(eu_total_avg, fmt='hex')
 
@@ -31,19 +43,27 @@ def create_bar_chart_year(df_year, year):
 
     bar_trace = go.Bar(
         # Country names on x-axis, Renewable Percentage on y-axis
-        x=df_year['Country'],
-        y=df_year['Renewable Percentage'],
+        x=countries,
+        y=shares,
         # Use a color scale for the bars
         marker=dict(
-            color=df_year['Renewable Percentage'], 
+            color=shares, 
             coloraxis='coloraxis'),
 
         # Custom hover template for each bar
         hovertemplate="Renewable Share: <b>%{y:.1f}%</b><br>" +
-                      "Country: <b>%{customdata[0]}</b> %{customdata[1]}",
+                      "Country: <b>%{x}</b> %{text}<br>" +
+                      "EU Rank: <b>#%{customdata[0]}</b>" +
+                      # Leave the change out in years without a previous year (e.g. the first year)
+                      ("<br>Change to Previous Year: <b>%{customdata[1]:+.1f} pp</b>" if ranked['has_change'] else ""),
 
-        # Pass country name and flag as customdata for hovertemplate
-        customdata=df_year[['Country', 'Flag']].values,
+        # Pass the flag as text for the hovertemplate (the name is already the x value)
+        text=ranked['flags'],
+        # Hide the text labels on the bars (only used in the hovertemplate)
+        textposition='none',
+
+        # Pass precomputed metrics as a numeric customdata block
+        customdata=ranked['customdata'],
         
         # Set trace name to selected year
         name=f"<b>{year}</b>",
@@ -56,9 +76,9 @@ def create_bar_chart_year(df_year, year):
     # This line will represent the average renewable energy percentage for the EU 
 
     scatter_avg = go.Scatter(
-        # Year on x-axis, EU average on y-axis
-        x=df_year['Country'],
-        y=[eu_total_avg] * len(df_year),
+        # Line from the first to the last country at the EU average
+        x=[countries[0], countries[-1]] if countries else [],
+        y=[eu_total_avg, eu_total_avg] if countries else [],
         # Use lines for the average
         mode="lines",
         # Solid line with the scaled color
@@ -84,6 +104,8 @@ def create_bar_chart_year(df_year, year):
     # This will set the title, axis labels, color scale, and other layout properties 
 
     fig.update_layout(
+        # Template with defaults only for the trace types used in this figure
+        template=compact_template('bar', 'scatter'),
         # Set the title of the chart
         title=f"<b>Share of Renewable Energy in the European Union in {year}</b>",
         # Set x-axis title to None (no title)
@@ -112,4 +134,14 @@ def create_bar_chart_year(df_year, year):
         # Set the height of the chart
         height=400,
     )
+
+    # Provenance (file and release) of the year's values, sent once per chart
+    # (see data/loader.merge_releases)
+    if arrays['year_sources']:
+        fig.add_annotation(
+            text="<i>Source: " + "; ".join(arrays['year_sources']) + "</i>",
+            xref="paper", yref="paper", x=1, y=1,
+            xanchor="right", yanchor="bottom",
+            showarrow=False, font=dict(size=10),
+        )
     return fig
\ No newline at end of file
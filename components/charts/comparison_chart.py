@@ -0,0 +1,109 @@
+# components/charts/comparison_chart.py
+
+import plotly.graph_objects as go
+from utils.colors import get_viridis_color, get_qualitative_colors
+from utils.encoding import compact_template, as_float32, as_int16
+
+# Name of the EU average trace (always the first trace of the figure)
+EU_TRACE_NAME = "<b>EU Total Average</b> 🇪🇺"
+
+
+def create_comparison_chart(by_country, df_eu_total, countries):
+    """
+    Returns a line chart comparing the share of renewable energy of several countries.
+
+    The figure holds one trace per country from the pre-grouped slices, built in
+    a single batch. Only the selected countries are visible; use
+    `update_comparison_chart` to change the selection without rebuilding the figure.
+
+    Args:
+        by_country (dict): Country name -> DataFrame sorted by year (see data/store.py).
+        df_eu_total (DataFrame): DataFrame containing total EU renewable energy data.
+        countries (list): Names of the countries to show initially.
+
+    Returns:
+        fig (Figure): A Plotly Figure object containing the comparison chart.
+    """
+    names = list(by_country)
+    colors = get_qualitative_colors(len(names))
+    selected = set(countries)
+    eu_avg = df_eu_total['Renewable Percentage'].mean()
+
+    # EU total average as a dashed line
+    eu_trace = go.Scatter(
+        x=as_int16(df_eu_total['Year']),
+        y=as_float32(df_eu_total['Renewable Percentage']),
+        mode='lines',
+        line=dict(color=get_viridis_color(eu_avg, fmt='hex'), width=4, dash='dash'),
+        name=EU_TRACE_NAME,
+        visible=True,
+        hovertemplate="Renewable Share: <b>%{y:.1f}%</b><br>"
+                      "Year: <b>%{x}</b>",
+    )
+
+    # One trace per country, all built at once from the pre-grouped slices
+    country_traces = [
+        go.Scatter(
+            x=as_int16(frame['Year']),
+            y=as_float32(frame['Renewable Percentage']),
+            mode='lines+markers',
+            line=dict(color=color, width=2),
+            marker=dict(size=5),
+            name=f"<b>{name}</b> {frame['Flag'].iloc[0]}",
+            hovertemplate="Renewable Share: <b>%{y:.1f}%</b><br>"
+                          "Year: <b>%{x}</b>",
+            visible=name in selected,
+        )
+        for (name, frame), color in zip(by_country.items(), colors)
+    ]
+
+    fig = go.Figure(data=[eu_trace, *country_traces])
+    # Remember the country order of the traces for incremental updates
+    fig.layout.meta = {'countries': names}
+
+    years = df_eu_total['Year']
+    min_year = years.min() if len(years) else 2004
+    max_year = years.max() if len(years) else 2024
+
+    fig.update_layout(
+        # Template with defaults only for the trace types used in this figure
+        template=compact_template('scatter'),
+        # Set the title of the chart
+        title="<b>Share of Renewable Energy: Country Comparison</b>",
+        # Set x-axis properties
+        xaxis=dict(
+            title="Year",
+            tickmode="linear",
+            dtick=5,
+            range=[min_year - 0.5, max_year + 0.5]),
+        # Set y-axis properties
+        yaxis_title="Renewable Energy (%)",
+        # Show the values of all visible countries for the hovered year
+        hovermode="x unified",
+        # Set margins around the chart
+        margin={"t": 50, "b": 50, "l": 50, "r": 50},
+        # Legend properties
+        legend=dict(
+            orientation="h",
+            yanchor="top", y=-0.15,
+            xanchor="left", x=0.01),
+        # Set the height of the chart
+        height=450,
+    )
+    return fig
+
+
+def update_comparison_chart(fig, countries):
+    """
+    Show only the given countries in a figure created by `create_comparison_chart`.
+
+    Only the trace visibility is changed (a single restyle), so a linked
+    Plotly pane sends the change to the browser without re-sending the data.
+
+    Args:
+        fig (Figure): Figure returned by `create_comparison_chart`.
+        countries (list): Names of the countries to show.
+    """
+    selected = set(countries)
+    visible = [True] + [name in selected for name in fig.layout.meta['countries']]
+    fig.plotly_restyle({'visible': visible})
@@ -2,40 +2,104 @@
 
 # Import necessary libraries
 
+# NumPy for the color range of regional values
+import numpy as np
 # Plotly for visualization
 import plotly.graph_objects as go
 # JSON for loading geojson data
 import json
+# Cache for the loaded geojson data
+from functools import lru_cache
 # Path handling for loading bundled data files
 from pathlib import Path
 # Mapbox token for accessing Mapbox styles
 from config import MAPBOX_TOKEN
 # Custom utility functions for color scale normalization
 from utils.colors import get_colorscale
+# Compact arrays and coordinates for smaller figure payloads
+from utils.encoding import compact_template, round_coordinates
+# Year lookup in the regional value matrix, per-year plot arrays
+from data.store import get_region_values, build_year_arrays
 
 
 GEOJSON_PATH = Path(__file__).resolve().parents[1] / 'geo' / 'europe.geojson'
 
+
+@lru_cache(maxsize=2)
+def load_geojson(path=GEOJSON_PATH, id_key='CNTR_ID'):
+    """
+    Load a GeoJSON file once, keeping only the feature id and rounded coordinates.
+
+    Args:
+        path (Path): GeoJSON file (countries by default, or NUTS regions).
+        id_key (str): Feature property holding the id ('CNTR_ID' or 'NUTS_ID').
+
+    Returns:
+        dict: Mapping of feature id to GeoJSON feature.
+    """
+    with open(path) as f:
+        geojson = json.load(f)
+    features = {}
+    for feature in geojson['features']:
+        feature_id = feature['properties'][id_key]
+        geometry = feature['geometry']
+        features[feature_id] = {
+            'type': 'Feature',
+            'properties': {id_key: feature_id},
+            'geometry': {
+                'type': geometry['type'],
+                'coordinates': round_coordinates(geometry['coordinates']),
+            },
+        }
+    return features
+
+
+@lru_cache(maxsize=8)
+def get_geojson(codes, path=GEOJSON_PATH, id_key='CNTR_ID'):
+    """
+    Return a FeatureCollection with only the given countries (or regions).
+
+    Args:
+        codes (tuple): Sorted tuple of feature ids.
+        path (Path): GeoJSON file, see `load_geojson`.
+        id_key (str): Feature property holding the id.
+
+    Returns:
+        dict: GeoJSON FeatureCollection.
+    """
+    features = load_geojson(path, id_key)
+    return {
+        'type': 'FeatureCollection',
+        'features': [features[code] for code in codes if code in features],
+    }
+
 # Create choropleth map using Plotly
 
-def create_choropleth_map(df_year):
+def create_choropleth_map(df_year, arrays=None):
     """
     Returns a choropleth map showing the share of renewable energy in the EU for a specific year.
     
     Args:
         df_year (DataFrame): DataFrame containing renewable energy data for the specified year.
+        arrays (dict, optional): Precomputed plot arrays of the year (see data/store.build_year_arrays).
+            Built from df_year if not given.
     
     Returns:
         fig (Figure): A Plotly Figure object containing the choropleth map.
     """
 
+    if arrays is None:
+        arrays = build_year_arrays(df_year)
+    # Provenance (file and release) of each value, see data/loader.merge_releases
+    sources = arrays['sources']
+
     fig = go.Figure(go.Choroplethmapbox(
-        # Load the GeoJSON file for Europe
-        geojson=json.load(open(GEOJSON_PATH)),
+        # Only send the boundaries of the countries shown on the map
+        geojson=get_geojson(arrays['geo_codes']),
         # Use the 'Code' column for locations
-        locations=df_year['Code'],
-        # Use the 'Renewable Percentage' column for color intensity
-        z=df_year['Renewable Percentage'],
+        locations=arrays['codes'],
+        # Use the 'Renewable Percentage' column for color intensity (float32)
+        z=arrays['shares'],
         # Use a custom color scale defined in utils/colors.py
         colorscale=get_colorscale(),
         zmin=0,                # <--- FIXED!
@@ -45,14 +109,16 @@ def create_choropleth_map(df_year):
         # Specify the feature ID key for the GeoJSON
         featureidkey="properties.CNTR_ID",
 
-        # Custom hover template to show country name, flag, and renewable percentage
+        # Custom hover template to show the country flag and renewable percentage
         hovertemplate=(
-            "%{customdata[1]}" +
-            "  <b>%{z:.1f}%</b>"
+            "%{text}" +
+            "  <b>%{z:.1f}%</b>" +
+            ("<br><i>Source: %{hovertext}</i>" if sources else "")
         ),
         
-        # Pass country name and flag as customdata for hovertemplate
-        customdata=df_year[['Country', 'Flag']].values,
+        # Pass only the flag (the only label used in the hovertemplate)
+        text=arrays['flags'],
+        hovertext=sources,
         
         # Fix to suppress showing trace info
         name="",
@@ -61,6 +127,8 @@ def create_choropleth_map(df_year):
     # Update the layout of the map
     # Set the mapbox style, zoom level, and center
     fig.update_layout(
+        # Template with defaults only for the trace types used in this figure
+        template=compact_template('choroplethmapbox'),
         # Set the Mapbox access token
         mapbox_accesstoken=MAPBOX_TOKEN,
         # Use a predefined Mapbox style
@@ -72,4 +140,76 @@ def create_choropleth_map(df_year):
         # Remove margins around the map
         margin={"r": 0, "t": 0, "l": 0, "b": 0}
     )
-    return fig
\ No newline at end of file
+    return fig
+
+
+# Create regional (NUTS-2) choropleth map using Plotly
+
+def create_regional_map(matrix, year, path, title, unit, zrange=None):
+    """
+    Returns a choropleth map of a regional indicator for a specific year.
+
+    All regions of the dataset are part of the figure, regions without a value
+    in that year are left empty. The geometry is sent to the browser once;
+    use `update_regional_map` to switch years.
+
+    Args:
+        matrix (dict): Year x region matrix returned by `build_region_matrix`.
+        year (int): The year shown on the map.
+        path (Path): GeoJSON file with the NUTS-2 boundaries.
+        title (str): Name of the indicator, shown in the color bar.
+        unit (str): Unit of the values, shown in the hover text.
+        zrange (tuple, optional): (min, max) of the color scale. Defaults to the range over all years.
+
+    Returns:
+        fig (Figure): A Plotly Figure object containing the map.
+    """
+    if zrange is None:
+        values = matrix['values']
+        zrange = (float(np.nanmin(values)), float(np.nanmax(values))) if np.isfinite(values).any() else (0, 1)
+
+    fig = go.Figure(go.Choroplethmapbox(
+        # All regions of the dataset, in matrix column order
+        locations=matrix['codes'],
+        featureidkey="properties.NUTS_ID",
+        # Values of the selected year (float32)
+        z=get_region_values(matrix, year),
+        colorscale=get_colorscale(),
+        zmin=zrange[0], zmax=zrange[1],
+        colorbar=dict(title=dict(text=title, side='right')),
+        marker_opacity=0.8, marker_line_width=0.3,
+        # Region name and value
+        hovertemplate="%{text}  <b>%{z:,.0f}</b> " + unit,
+        text=matrix['names'],
+        name="",
+    ))
+
+    # Assign the (cached) geometry after creating the figure: passing it to the
+    # constructor deep-copies every coordinate, assigning keeps a reference
+    fig.data[0].geojson = get_geojson(tuple(sorted(matrix['codes'])), path, 'NUTS_ID')
+
+    fig.update_layout(
+        template=compact_template('choroplethmapbox'),
+        mapbox_accesstoken=MAPBOX_TOKEN,
+        mapbox_style="carto-positron",
+        mapbox_zoom=2.75,
+        mapbox_center={"lat": 56, "lon": 8},
+        margin={"r": 0, "t": 0, "l": 0, "b": 0},
+        # Keep zoom and position when the values change
+        uirevision='regions',
+    )
+    return fig
+
+
+def update_regional_map(fig, matrix, year):
+    """
+    Show another year on a map created by `create_regional_map`.
+
+    Only the values are updated, the geometry stays in the browser.
+
+    Args:
+        fig (Figure): Figure returned by `create_regional_map`.
+        matrix (dict): Year x region matrix the figure was created from.
+        year (int): The year to show.
+    """
+    fig.plotly_restyle({'z': [get_region_values(matrix, year)]}, trace_indexes=[0])
@@ -0,0 +1,83 @@
+# components/regional.py
+
+import panel as pn
+
+from components.map import create_regional_map, update_regional_map
+from data.registry import available_datasets
+from data.store import build_region_matrix
+
+
+def regional_available():
+    """Return True if the NUTS-2 boundaries and at least one regional dataset are available."""
+    return bool(available_datasets('nuts2'))
+
+
+def create_regional_view(dataset_cache):
+    """
+    Create the regional (NUTS-2) map with its indicator, category and year selectors.
+
+    The dataset is loaded from the dataset cache when the view is created. The map
+    is built once per indicator and category; changing the year only replaces the
+    values of the map, not the region geometry.
+
+    Args:
+        dataset_cache (DatasetCache): Cache returned by `get_dataset_cache`.
+
+    Returns:
+        pn.Column: The regional view panel.
+    """
+    datasets = available_datasets('nuts2')
+    dataset_select = pn.widgets.Select(
+        name='Indicator', options={spec.title: key for key, spec in datasets.items()}
+    )
+    category_select = pn.widgets.Select(name='Category')
+    year_slider = pn.widgets.IntSlider(name='Year', start=0, end=1, value=1)
+    map_pane = pn.pane.Plotly(sizing_mode='stretch_width', height=600)
+    state = {}
+
+    def show_category(category):
+        spec, table = state['spec'], state['table']
+        matrix = pn.state.as_cached(
+            'region_matrix', lambda dataset, category: build_region_matrix(
+                table[table[spec.category_label] == category], spec.value_label, name_label=spec.geo.label
+            ),
+            dataset=spec.key, category=category,
+        )
+        state['matrix'] = matrix
+        years = sorted(matrix['years'])
+        # Keep the selected year if the new data has it, otherwise show the latest year
+        year = year_slider.value if year_slider.value in matrix['years'] else years[-1]
+        # Update the slider range; the map is rebuilt below, so skip the year watcher
+        state['rebuilding'] = True
+        try:
+            year_slider.param.update(start=years[0], end=years[-1], value=year)
+        finally:
+            state['rebuilding'] = False
+        map_pane.object = create_regional_map(
+            matrix, year, spec.geo.path, title=category, unit=spec.unit
+        )
+
+    def show_dataset(key):
+        spec = datasets[key]
+        table = dataset_cache.get(key)
+        state.update(spec=spec, table=table)
+        categories = table[spec.category_label].cat.categories.tolist()
+        if category_select.value == categories[0]:
+            show_category(categories[0])
+        # Otherwise the category watcher rebuilds the map
+        category_select.param.update(options=categories, value=categories[0])
+
+    category_select.param.watch(lambda event: show_category(event.new), 'value')
+    dataset_select.param.watch(lambda event: show_dataset(event.new), 'value')
+    def show_year(event):
+        if not state.get('rebuilding'):
+            update_regional_map(map_pane.object, state['matrix'], event.new)
+
+    year_slider.param.watch(show_year, 'value')
+    show_dataset(dataset_select.value)
+
+    return pn.Column(
+        pn.Row(dataset_select, category_select),
+        year_slider,
+        map_pane,
+    )
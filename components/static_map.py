@@ -0,0 +1,225 @@
+# components/static_map.py
+
+# Import necessary libraries
+
+# Standard libraries for hashing, caching, threads and in-memory buffers
+import hashlib
+import io
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+# Pandas for hashing the dataset, Panel for request information
+import pandas as pd
+import panel as pn
+# Pillow for local raster rendering (installed with Bokeh)
+from PIL import Image, ImageDraw
+
+# Boundaries shared with the interactive map
+from components.map import load_geojson
+# Viridis colors matching the interactive map
+from utils.colors import get_viridis_color
+
+
+# Map extent (lon/lat) roughly matching the interactive map view
+BOUNDS = (-25.0, 33.0, 45.0, 72.0)
+# Output image size in pixels (width, height)
+SIZE = (720, 640)
+# Render at a higher resolution and downscale for smooth edges
+SUPERSAMPLE = 2
+# Colors for the background, countries without data and borders
+BACKGROUND_COLOR = '#f2f2f0'
+NO_DATA_COLOR = '#d9d9d9'
+BORDER_COLOR = '#ffffff'
+
+
+def _mercator_y(lat):
+    """Project a latitude to Web Mercator (unscaled)."""
+    return math.log(math.tan(math.pi / 4 + math.radians(lat) / 2))
+
+
+def _make_projection(size):
+    """Return a function mapping (lon, lat) to pixel coordinates for the given image size."""
+    width, height = size
+    west, south, east, north = BOUNDS
+    top, bottom = _mercator_y(north), _mercator_y(south)
+
+    def project(lon, lat):
+        x = (lon - west) / (east - west) * width
+        y = (top - _mercator_y(max(min(lat, 85.0), -85.0))) / (top - bottom) * height
+        return x, y
+
+    return project
+
+
+def _polygons(geometry):
+    """Yield the exterior rings of a Polygon or MultiPolygon geometry."""
+    if geometry['type'] == 'Polygon':
+        yield geometry['coordinates'][0]
+    elif geometry['type'] == 'MultiPolygon':
+        for polygon in geometry['coordinates']:
+            yield polygon[0]
+
+
+def _in_bounds(ring):
+    """Check if a ring overlaps the map extent."""
+    west, south, east, north = BOUNDS
+    lons = [point[0] for point in ring]
+    lats = [point[1] for point in ring]
+    return max(lons) >= west and min(lons) <= east and max(lats) >= south and min(lats) <= north
+
+
+@lru_cache(maxsize=4)
+def _projected_rings(size):
+    """
+    Project all country outlines inside the map extent to pixel coordinates once per image size.
+
+    Returns:
+        list: (CNTR_ID, list of (x, y) points) per ring.
+    """
+    project = _make_projection(size)
+    rings = []
+    for code, feature in load_geojson().items():
+        for ring in _polygons(feature['geometry']):
+            if len(ring) >= 3 and _in_bounds(ring):
+                rings.append((code, [project(lon, lat) for lon, lat in ring]))
+    return rings
+
+
+def _draw_legend(draw, size):
+    """Draw a horizontal 0–100 % color bar in the lower right corner."""
+    width, height = size
+    bar_width, bar_height = width // 4, max(height // 60, 6)
+    left, top = width - bar_width - width // 30, height - bar_height - height // 15
+    for x in range(bar_width):
+        draw.line([(left + x, top), (left + x, top + bar_height)], fill=get_viridis_color(100 * x / (bar_width - 1), fmt='hex'))
+    draw.rectangle([left, top, left + bar_width, top + bar_height], outline='#666666')
+    draw.text((left, top + bar_height + 4), "0%", fill='#333333')
+    draw.text((left + bar_width, top + bar_height + 4), "100%", fill='#333333', anchor='ra')
+
+
+def render_map_snapshot(df_year, fmt='webp', size=SIZE):
+    """
+    Render the choropleth map for one year as a static image, without network tiles.
+
+    Countries are filled with the same Viridis scale (0–100 %) as the interactive map,
+    countries without data are grey.
+
+    Args:
+        df_year (DataFrame): DataFrame containing renewable energy data for one year.
+        fmt (str): Image format, 'webp' or 'png'.
+        size (tuple): Image size in pixels (width, height).
+
+    Returns:
+        bytes: The encoded image.
+    """
+    scaled = (size[0] * SUPERSAMPLE, size[1] * SUPERSAMPLE)
+    colors = {
+        code: get_viridis_color(value, fmt='hex')
+        for code, value in zip(df_year['Code'], df_year['Renewable Percentage'])
+        if pd.notna(value)
+    }
+
+    image = Image.new('RGB', scaled, BACKGROUND_COLOR)
+    draw = ImageDraw.Draw(image)
+    for code, points in _projected_rings(scaled):
+        draw.polygon(points, fill=colors.get(code, NO_DATA_COLOR), outline=BORDER_COLOR, width=SUPERSAMPLE)
+
+    image = image.resize(size, Image.LANCZOS)
+    _draw_legend(ImageDraw.Draw(image), size)
+    buffer = io.BytesIO()
+    if fmt == 'webp':
+        image.save(buffer, format='WEBP', quality=85, method=4)
+    elif fmt == 'png':
+        image.save(buffer, format='PNG', optimize=True)
+    else:
+        raise ValueError("fmt must be either 'webp' or 'png'")
+    return buffer.getvalue()
+
+
+def use_static_map():
+    """
+    Check if the current session should get the static map instead of the WebGL map.
+
+    True if the URL contains `?static=1`, or the browser asks to save data
+    (`Save-Data: on`) or reports a slow connection (`ECT: slow-2g / 2g`).
+    """
+    args = pn.state.session_args or {}
+    static = args.get('static', [b''])[0]
+    if isinstance(static, bytes):
+        static = static.decode()
+    if static.lower() in ('1', 'true', 'yes'):
+        return True
+    # Header names are normalized by the server (e.g. 'Ect'), so compare them in lower case
+    headers = {name.lower(): value for name, value in (pn.state.headers or {}).items()}
+    return headers.get('save-data', '').lower() == 'on' or headers.get('ect', '').lower() in ('slow-2g', '2g')
+
+
+def dataset_version(df):
+    """Return a short hash of the map data, used to invalidate cached snapshots."""
+    values = pd.util.hash_pandas_object(df[['Code', 'Year', 'Renewable Percentage']], index=False)
+    return hashlib.sha1(values.values.tobytes()).hexdigest()[:12]
+
+
+class SnapshotCache:
+    """
+    In-memory and on-disk cache of rendered map snapshots, keyed by year,
+    dataset version and image format.
+
+    Args:
+        by_year (dict): Year -> DataFrame (see data/store.py).
+        version (str): Dataset version, see `dataset_version`.
+        directory (Path): Directory for cached image files.
+        fmt (str): Image format, 'webp' or 'png'.
+    """
+
+    def __init__(self, by_year, version, directory, fmt='webp'):
+        self.by_year = by_year
+        self.version = version
+        self.directory = Path(directory)
+        self.fmt = fmt
+        self._images = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _path(self, year):
+        return self.directory / f"map_{self.version}_{year}.{self.fmt}"
+
+    def get(self, year):
+        """Return the snapshot for a year, rendering and storing it if needed."""
+        key = (int(year), self.version, self.fmt)
+        image = self._images.get(key)
+        if image is not None:
+            return image
+
+        path = self._path(year)
+        if path.exists():
+            image = path.read_bytes()
+        else:
+            image = render_map_snapshot(self.by_year[int(year)], fmt=self.fmt)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see partial images
+            tmp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+            tmp_path.write_bytes(image)
+            tmp_path.replace(path)
+
+        with self._lock:
+            self._images[key] = image
+        return image
+
+    def warm(self, years=None, max_workers=4):
+        """
+        Render snapshots for the given years (default: all) in background threads.
+
+        Returns immediately; `get` renders on demand for years not yet done.
+        Only the first call starts rendering.
+        """
+        years = list(self.by_year) if years is None else years
+        with self._lock:
+            if self._executor is not None:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='map-snapshot')
+        for year in years:
+            self._executor.submit(self.get, year)
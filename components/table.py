@@ -0,0 +1,117 @@
+# components/table.py
+
+import json
+from urllib.parse import urlencode
+
+import pandas as pd
+import panel as pn
+
+from data.export import parquet_available
+from data.registry import available_datasets
+
+# Indicator shown when the data explorer is opened
+DEFAULT_DATASET = 'nrg_ind_ren'
+
+
+def header_filters(table_data):
+    '''
+    Function to build Tabulator header filters from the columns of a dataset table.
+    Name and code columns get a text filter, other categories a list,
+    the year an exact match and values a minimum.
+    '''
+    filters = {}
+    for column, dtype in table_data.dtypes.items():
+        if column in ('Country', 'Region', 'Code'):
+            filters[column] = {'type': 'input', 'func': 'like', 'placeholder': column}
+        elif isinstance(dtype, pd.CategoricalDtype):
+            # List all categories: with remote pagination the browser only holds the current page
+            filters[column] = {'type': 'list', 'values': dtype.categories.tolist(), 'placeholder': column}
+        elif column == 'Year':
+            filters[column] = {'type': 'number', 'func': '=', 'placeholder': column}
+        elif dtype.kind in 'iuf':
+            filters[column] = {'type': 'number', 'func': '>=', 'placeholder': 'Min.'}
+    return filters
+
+
+def create_data_table(table_data, page_size=15):
+    """
+    Create a paginated data table for exploring the full dataset.
+
+    Pagination is handled on the server ('remote'), so sorting and filtering
+    are applied to the DataFrame in Python and only the visible page is sent
+    to the browser.
+
+    Args:
+        table_data (pd.DataFrame): DataFrame returned by `load_indicator`.
+        page_size (int): Number of rows per page.
+
+    Returns:
+        pn.widgets.Tabulator: The data table widget.
+    """
+    return pn.widgets.Tabulator(
+        table_data,
+        pagination='remote',
+        page_size=page_size,
+        header_filters=header_filters(table_data),
+        show_index=False,
+        disabled=True,
+        layout='fit_data_stretch',
+        sizing_mode='stretch_width',
+    )
+
+
+def create_download_links(table, dataset_select):
+    """
+    Create download links for the rows currently matched by the table filters.
+
+    The links point to the streaming routes in `downloads.py`.
+
+    Args:
+        table (pn.widgets.Tabulator): The data table widget.
+        dataset_select (pn.widgets.Select): Widget holding the selected dataset key.
+
+    Returns:
+        Bound function returning a Markdown pane with the download links.
+    """
+    formats = ['csv', 'parquet'] if parquet_available() else ['csv']
+
+    def links(filters, dataset):
+        query = urlencode({'dataset': dataset, 'filters': json.dumps(filters or [])})
+        items = [f"[{fmt.upper()}](download/{fmt}?{query})" for fmt in formats]
+        return pn.pane.Markdown("⬇️ **Download filtered data:** " + " | ".join(items))
+
+    return pn.bind(links, table.param.filters, dataset_select.param.value)
+
+
+def create_data_explorer(dataset_cache):
+    """
+    Combine an indicator selector, the data table and the download links into one panel.
+
+    Indicators are loaded from the dataset cache the first time they are selected.
+
+    Args:
+        dataset_cache (DatasetCache): Cache returned by `get_dataset_cache`.
+
+    Returns:
+        pn.Column: The data explorer panel.
+    """
+    dataset_select = pn.widgets.Select(
+        name='Indicator',
+        options={spec.title: key for key, spec in available_datasets().items()},
+        value=DEFAULT_DATASET,
+    )
+    table = create_data_table(dataset_cache.get(DEFAULT_DATASET))
+
+    def show_dataset(event):
+        table_data = dataset_cache.get(event.new)
+        # Reset filters of the previous indicator before swapping the columns
+        table.filters = []
+        table.header_filters = header_filters(table_data)
+        table.value = table_data
+
+    dataset_select.param.watch(show_dataset, 'value')
+    return pn.Column(
+        dataset_select,
+        create_download_links(table, dataset_select),
+        table,
+    )
@@ -25,3 +25,19 @@ def create_widgets(df_renewable):
 
     return year_slider, country_select
 
+
+def create_comparison_widget(df_renewable):
+    """
+    Create a multi-select widget for comparing several countries.
+
+    Args:
+        df_renewable (pd.DataFrame): DataFrame containing renewable energy data.
+
+    Returns:
+        pn.widgets.MultiChoice: Country multi-select widget.
+    """
+    countries = sorted(df_renewable['Country'].unique().tolist())
+    return pn.widgets.MultiChoice(
+        name='Countries', options=countries, value=[c for c in ['Germany', 'France', 'Sweden'] if c in countries],
+        max_items=len(countries)
+    )
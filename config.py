@@ -21,3 +21,24 @@ LOGO_PATH = ASSETS_DIR / "logo-500px.png"
 
 # Picture path
 PICTURE_PATH = ASSETS_DIR / "europe-renewables-500px.png"
+
+# Data directory
+DATA_DIR = BASE_DIR / "data"
+
+# Memory budget for lazily loaded datasets (see data/registry.py)
+DATASET_CACHE_BUDGET_MB = 64
+
+# GeoJSON path
+GEO_PATH = BASE_DIR / "geo" / "europe.geojson"
+
+# Optional NUTS-2 boundaries for the regional view (Eurostat GISCO, NUTS_RG_20M_2021_4326_LEVL_2.geojson)
+NUTS2_GEO_PATH = BASE_DIR / "geo" / "nuts2.geojson"
+
+# Number of dashboards built in advance for new sessions (0 disables the pool, see layout/session.py)
+SESSION_POOL_SIZE = 2
+
+# Cache directory for rendered map snapshots (static map fallback)
+SNAPSHOT_DIR = BASE_DIR / ".cache" / "snapshots"
+
+# Output directory for opt-in callback profiles (see utils/profiling.py)
+PROFILE_DIR = BASE_DIR / ".cache" / "profiles"
@@ -0,0 +1,98 @@
+# data/analytics.py
+
+# Import necessary libraries
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# EU-wide 2030 target for the share of renewable energy (Directive (EU) 2023/2413)
+TARGET_2030 = 42.5
+
+# Number of years used for the rolling average
+ROLLING_WINDOW = 3
+
+
+def compute_country_metrics(df_renewable: pd.DataFrame) -> pd.DataFrame:
+    '''
+    Function to derive trend metrics for every country and year in one pass.
+    Adds the columns:
+    - YoY Change: change in percentage points against the previous year
+    - CAGR: compound annual growth rate (%) since the first available year
+    - Rolling Average: mean over the last ROLLING_WINDOW years
+    - EU Rank: rank among all countries in the same year (1 = highest share)
+    - Gap to EU 2030 Target: percentage points missing to the EU-wide TARGET_2030
+      (negative = reached). National 2030 contributions differ from the EU target,
+      so this only compares a country with the EU-wide goal.
+    '''
+    df = df_renewable.sort_values(['Code', 'Year'])
+    share = df['Renewable Percentage']
+    by_country = df.groupby('Code', sort=False)
+
+    # Year-over-year change, only where the previous row is the previous year
+    year_step = by_country['Year'].diff()
+    df['YoY Change'] = share.diff().where(year_step == 1).round(1)
+
+    # CAGR against the first available year of each country
+    first_share = by_country['Renewable Percentage'].transform('first')
+    years = df['Year'] - by_country['Year'].transform('first')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cagr = (share / first_share) ** (1 / years) - 1
+    df['CAGR'] = (cagr.where((years > 0) & (first_share > 0)) * 100).round(2)
+
+    # Rolling average per country
+    rolling = by_country['Renewable Percentage'].rolling(ROLLING_WINDOW, min_periods=1).mean()
+    df['Rolling Average'] = rolling.reset_index(level=0, drop=True).round(1)
+
+    # Rank within each year
+    df['EU Rank'] = df.groupby('Year')['Renewable Percentage'].rank(ascending=False, method='min').astype('Int16')
+
+    # Distance to the EU-wide 2030 target
+    df['Gap to EU 2030 Target'] = (TARGET_2030 - share).round(1)
+
+    return df.sort_index()
+
+
+def compute_eu_metrics(
+    df_renewable: pd.DataFrame,
+    df_eu_total: pd.DataFrame,
+    consumption: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    '''
+    Function to derive EU-level metrics per year.
+    Adds the columns:
+    - Weighted Percentage: EU share weighted by gross final energy consumption.
+      The consumption of each country is derived from its renewable consumption
+      (KTOE, see `load_renewable_consumption`) and its renewable share.
+      Years without consumption data are left empty.
+    - Gap to EU 2030 Target: percentage points missing to TARGET_2030
+    '''
+    df_eu_total = df_eu_total.copy()
+    df_eu_total['Weighted Percentage'] = np.nan
+
+    if consumption is not None and not consumption.empty:
+        weights = df_renewable[['Code', 'Year', 'Renewable Percentage']].merge(
+            consumption, on=['Code', 'Year'], how='inner'
+        )
+        weights = weights[weights['Renewable Percentage'] > 0]
+        # Gross final consumption = renewable consumption / renewable share
+        weights['Gross Final Consumption'] = weights['Renewable Consumption'] * 100 / weights['Renewable Percentage']
+        totals = weights.groupby('Year')[['Renewable Consumption', 'Gross Final Consumption']].sum()
+        weighted = totals['Renewable Consumption'] * 100 / totals['Gross Final Consumption']
+        df_eu_total['Weighted Percentage'] = df_eu_total['Year'].map(weighted).round(1)
+
+    df_eu_total['Gap to EU 2030 Target'] = (TARGET_2030 - df_eu_total['Renewable Percentage']).round(1)
+    return df_eu_total
+
+
+def precompute_analytics(
+    df_renewable: pd.DataFrame,
+    df_eu_total: pd.DataFrame,
+    consumption: Optional[pd.DataFrame] = None
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    '''
+    Function to precompute all derived metrics once at start-up.
+    Returns the country and EU DataFrames with the metric columns added,
+    so charts can read them instead of computing them per request.
+    '''
+    return compute_country_metrics(df_renewable), compute_eu_metrics(df_renewable, df_eu_total, consumption)
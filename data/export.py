@@ -0,0 +1,120 @@
+# data/export.py
+
+# Import necessary libraries
+
+# Standard libraries io for in-memory buffers, typing for type hints
+import io
+from typing import Iterator, Sequence
+
+# Pandas for data manipulation
+import pandas as pd
+
+# PyArrow is optional and only needed for Parquet exports
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+# Number of rows written per chunk when streaming exports
+CHUNK_SIZE = 500
+
+
+def parquet_available() -> bool:
+    """Return True if Parquet exports are supported (requires pyarrow)."""
+    return pq is not None
+
+
+def apply_filters(table: pd.DataFrame, filters: Sequence[dict]) -> pd.DataFrame:
+    '''
+    Function to apply Tabulator header filters to a DataFrame.
+    Each filter is a dict with 'field', 'type' and 'value' keys, as provided
+    by the `filters` parameter of the Tabulator widget.
+    '''
+    mask = pd.Series(True, index=table.index)
+    for filt in filters:
+        field, op, value = filt.get('field'), filt.get('type', '='), filt.get('value')
+        if field not in table.columns or value in (None, '', []):
+            continue
+        column = table[field]
+        # Cast numeric filter values to the column type (values arrive as strings)
+        if column.dtype.kind in 'iuf' and not isinstance(value, list):
+            value = column.dtype.type(value)
+        if op == '=':
+            mask &= column == value
+        elif op == '!=':
+            mask &= column != value
+        elif op == '<':
+            mask &= column < value
+        elif op == '>':
+            mask &= column > value
+        elif op == '<=':
+            mask &= column <= value
+        elif op == '>=':
+            mask &= column >= value
+        elif op == 'in':
+            mask &= column.isin(value if isinstance(value, list) else [value])
+        elif op == 'like':
+            mask &= column.astype(str).str.contains(str(value), case=False, regex=False)
+        else:
+            raise ValueError(f"Filter type {op!r} not supported.")
+    return table[mask]
+
+
+def iter_csv_chunks(table: pd.DataFrame, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yield a DataFrame as CSV, `chunk_size` rows at a time.
+
+    Only the header is written when the DataFrame is empty.
+    """
+    yield table.iloc[:0].to_csv(index=False).encode('utf-8')
+    for start in range(0, len(table), chunk_size):
+        chunk = table.iloc[start:start + chunk_size]
+        yield chunk.to_csv(index=False, header=False).encode('utf-8')
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands out written bytes and keeps track of the position."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_parquet_chunks(table: pd.DataFrame, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yield a DataFrame as a Parquet file, writing one row group per chunk.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    if pq is None:
+        raise ImportError("Parquet export requires the 'pyarrow' package.")
+
+    sink = _ChunkSink()
+    schema = pa.Schema.from_pandas(table, preserve_index=False)
+    with pq.ParquetWriter(sink, schema) as writer:
+        for start in range(0, len(table), chunk_size):
+            chunk = table.iloc[start:start + chunk_size]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield sink.drain()
+    # The footer is written when the writer is closed
+    yield sink.drain()
@@ -2,6 +2,8 @@
 
 import pandas as pd
 from utils.flags import add_country_flags
+from data.loader import build_country_mapping
+from data.registry import get_dataset
 
 # Preprocess the data to merge with Europe GeoDataFrame and clean up columns
 
@@ -11,13 +13,10 @@ def preprocess(data: pd.DataFrame, europe: pd.DataFrame) -> pd.DataFrame:
     Merges the energy data with Europe GeoDataFrame, renames columns, and formats the data.
     '''
     data = data.copy()
-    country_mapping = {}
-    for _, row in europe.iterrows():
-        for value in [row.get('NAME_ENGL'), row.get('CNTR_ID'), row.get('ISO3_CODE'), row.get('ISO2_Code')]:
-            if pd.notna(value):
-                country_mapping[str(value).strip()] = row['CNTR_ID']
+    country_mapping = build_country_mapping(europe)
 
-    data['geo_key'] = data['geo'].astype(str).map(country_mapping).fillna(data['geo']).astype(str)
+    if 'geo_key' not in data.columns:
+        data['geo_key'] = data['geo'].astype(str).map(country_mapping).fillna(data['geo']).astype(str)
     merged = europe.merge(data, left_on='CNTR_ID', right_on='geo_key')
     # Rename columns to standardized format
     merged.rename(columns={
@@ -25,15 +24,8 @@ def preprocess(data: pd.DataFrame, europe: pd.DataFrame) -> pd.DataFrame:
         'OBS_VALUE': 'Renewable Percentage',
         'NAME_ENGL': 'Country'
     }, inplace=True)
-    # Replace energy type codes with human-readable names
-    energy_type_map = {
-        'Renewable energy - overall': 'Renewable Energy Total',
-        'Renewable energy - electricity': 'Renewable Electricity',
-        'Renewable energy - heating and cooling': 'Renewable Heating and Cooling',
-        'Renewable energy - transport': 'Renewable Energy in Transport'
-    }
-    # Apply the energy type mapping
-    merged['Energy Type'] = merged['Energy Type'].replace(energy_type_map)
+    # Replace energy type labels with human-readable names
+    merged['Energy Type'] = merged['Energy Type'].replace(get_dataset('nrg_ind_ren').labels)
     # Drop unnecessary columns
     columns_to_drop = ['DATAFLOW', 'LAST UPDATE', 'freq', 'unit', 'OBS_FLAG', 'CONF_STATUS', 'geo', 'geo_key']
     merged.drop(columns=columns_to_drop, inplace=True, errors='ignore')
@@ -43,8 +35,6 @@ def preprocess(data: pd.DataFrame, europe: pd.DataFrame) -> pd.DataFrame:
     merged['Renewable Percentage'] = merged['Renewable Percentage'].round(1)
     # Add 'Code' column from 'CNTR_ID' for plotting
     merged['Code'] = merged['CNTR_ID']
-    # Deduplicate rows that represent the same country/year/energy combination
-    merged = merged.drop_duplicates(subset=['Code', 'Year', 'Energy Type'], keep='last')
     # Add ISO2_Code for flag purposes (EL→GR), but keep Code as EL for plotting
     merged['ISO2_Code'] = merged['Code'].replace('EL', 'GR')
     # Add country flags based on ISO2_Code
@@ -53,9 +43,12 @@ def preprocess(data: pd.DataFrame, europe: pd.DataFrame) -> pd.DataFrame:
 
 # Filter the data for EU countries and calculate average renewable percentage
 def filter_data(merged: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    '''
+    Function to select the renewable energy total of the EU member states and the EU average per year.
+    Overlapping releases are resolved once when loading (see data/loader.merge_releases).
+    '''
     eu_countries = {"AT", "BE", "BG", "HR", "CY", "CZ", "DK", "EE", "FI", "FR", "DE", "EL", "HU", "IE", "IT", "LV", "LT",
                     "LU", "MT", "NL", "PL", "PT", "RO", "SK", "SI", "ES", "SE"}
     df_renewable = merged[(merged['Energy Type'] == 'Renewable Energy Total') & merged['Code'].isin(eu_countries)]
-    df_renewable = df_renewable.drop_duplicates(subset=['Code', 'Year'], keep='last')
     df_eu_total = df_renewable.groupby('Year', as_index=False)['Renewable Percentage'].mean().reset_index()
     return df_renewable, df_eu_total
\ No newline at end of file
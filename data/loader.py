@@ -4,7 +4,9 @@
 
 # Standard libraries os for file handling, typing for type hints
 import os
-from typing import Union, Tuple, Sequence
+import threading
+from functools import lru_cache
+from typing import Optional, Union, Tuple, Sequence
 
 # Pandas for data manipulation, GeoPandas for geographic data handling
 import pandas as pd
@@ -12,27 +14,56 @@ import pandas as pd
 # GeoPandas for geographic data handling
 import geopandas as gpd
 
-# Custom utility function to convert ISO2 country code to flag emoji
-from utils.flags import iso2_to_flag
+# Panel for the server task evicting idle datasets
+import panel as pn
 
+# Custom utility function to add flag emoji from ISO2 country codes
+from utils.flags import add_country_flags
+
+# Dataset registry describing files, units and code maps of each indicator
+from data.registry import DatasetSpec, DatasetCache, get_dataset
+from config import GEO_PATH
+
+
+def build_country_mapping(europe_gdf: pd.DataFrame) -> dict:
+    """Map country names and codes (NAME_ENGL, CNTR_ID, ISO3_CODE, ISO2_Code) to CNTR_ID."""
+    country_mapping = {}
+    for column in ['NAME_ENGL', 'CNTR_ID', 'ISO3_CODE', 'ISO2_Code']:
+        if column not in europe_gdf.columns:
+            continue
+        valid = europe_gdf[column].notna()
+        keys = europe_gdf.loc[valid, column].astype(str).str.strip()
+        country_mapping.update(zip(keys, europe_gdf.loc[valid, 'CNTR_ID']))
+    return country_mapping
+
+
+def build_geo_mapping(geo_df: pd.DataFrame, spec: DatasetSpec) -> dict:
+    """Map the ids and names of the dataset's geographic level to the map id (e.g. NUTS_ID)."""
+    if spec.geo_level == 'country':
+        return build_country_mapping(geo_df)
+    level = spec.geo
+    mapping = dict(zip(geo_df[level.name_column].astype(str).str.strip(), geo_df[level.id_column]))
+    mapping.update(zip(geo_df[level.id_column], geo_df[level.id_column]))
+    return mapping
 
-def _normalize_frame_columns(frame: pd.DataFrame) -> pd.DataFrame:
-    """Normalize Eurostat renewable datasets from different export formats."""
-    frame = frame.copy()
 
-    if 'nrg_bal' not in frame.columns and 'siec' in frame.columns:
-        frame = frame.rename(columns={'siec': 'nrg_bal'})
+def _normalize_frame_columns(frame: pd.DataFrame, spec: Optional[DatasetSpec] = None) -> pd.DataFrame:
+    """Normalize Eurostat datasets from different export formats (codes or labels)."""
+    spec = spec or get_dataset('nrg_ind_ren')
+    frame = frame.copy()
+    dimension = spec.dimension
 
-    if 'nrg_bal' in frame.columns:
-        frame['nrg_bal'] = frame['nrg_bal'].astype(str).str.strip()
-        frame['nrg_bal'] = frame['nrg_bal'].replace({
-            'REN': 'Renewable energy - overall',
-            'R5110-5150_W6000RIS': 'Renewable energy - overall',
-            'Renewable energy - overall': 'Renewable energy - overall',
-        })
+    # Older export formats name the category column differently (e.g. 'siec')
+    for alias in spec.column_aliases:
+        if dimension not in frame.columns and alias in frame.columns:
+            frame = frame.rename(columns={alias: dimension})
 
-    if 'nrg_bal' not in frame.columns:
-        frame['nrg_bal'] = 'Renewable energy - overall'
+    if dimension in frame.columns:
+        # Normalize each distinct value once instead of every row
+        frame[dimension] = frame[dimension].map(_lookup(frame[dimension], spec.codes))
+    else:
+        # Exports without the category column only contain the default category
+        frame[dimension] = next(iter(spec.codes.values()))
 
     if 'TIME_PERIOD' in frame.columns:
         frame['TIME_PERIOD'] = pd.to_numeric(frame['TIME_PERIOD'], errors='coerce')
@@ -40,6 +71,59 @@ def _normalize_frame_columns(frame: pd.DataFrame) -> pd.DataFrame:
     return frame
 
 
+def _lookup(values: pd.Series, mapping: dict, default=None) -> dict:
+    """Map each distinct value (stripped) through mapping; unmapped values are kept or set to default."""
+    lookup = {}
+    for value in values.unique():
+        key = str(value).strip()
+        lookup[value] = mapping.get(key, key if default is None else default)
+    return lookup
+
+
+def _add_source(frame: pd.DataFrame, path) -> pd.DataFrame:
+    """Replace the LAST UPDATE column with a categorical Source column (file and release)."""
+    name = os.path.basename(str(path))
+    if 'LAST UPDATE' in frame.columns:
+        updates = frame.pop('LAST UPDATE').astype('category')
+        # Release date only ('13/05/26 23:00:00' -> '13/05/26') unless that is ambiguous
+        labels = [f"{name}, {str(update).split(' ')[0]}" for update in updates.cat.categories]
+        if len(set(labels)) < len(labels):
+            labels = [f"{name}, {update}" for update in updates.cat.categories]
+        frame['Source'] = updates.cat.rename_categories(labels)
+    else:
+        frame['Source'] = pd.Categorical([name] * len(frame))
+    return frame
+
+
+def merge_releases(frames: Sequence[pd.DataFrame], keys: Sequence[str]) -> pd.DataFrame:
+    '''
+    Function to merge several releases of a dataset by key with source precedence.
+    Parameters:
+    - frames: DataFrames in order of precedence (current release first).
+    - keys: Columns identifying one value (e.g. geo key, year and energy type).
+    Returns:
+    - DataFrame with one row per key, taken from the first frame that contains the key.
+      Categorical columns (e.g. Source) stay categorical with the union of categories.
+    '''
+    keys = list(keys)
+    parts, seen = [], None
+    for frame in frames:
+        index = pd.MultiIndex.from_frame(frame[keys])
+        # Keep the first row per key that is not already provided by a preceding release
+        keep = ~index.duplicated()
+        if seen is not None:
+            keep &= ~index.isin(seen)
+        parts.append(frame[keep])
+        seen = index[keep] if seen is None else seen.append(index[keep])
+
+    # Align categories so concatenation keeps the compact categorical codes
+    for column in parts[0].columns:
+        if all(isinstance(part[column].dtype, pd.CategoricalDtype) for part in parts if column in part):
+            categories = pd.api.types.union_categoricals([part[column] for part in parts]).categories
+            parts = [part.assign(**{column: part[column].cat.set_categories(categories)}) for part in parts]
+    return pd.concat(parts, ignore_index=True)
+
+
 def load_data(
     data_path: Union[str, Sequence[str]] = (
         './data/nrg_ind_ren_linear.csv',
@@ -67,22 +151,19 @@ def load_data(
         raise FileNotFoundError("Missing input data files.")
 
     europe_gdf = gpd.read_file(geo_path)
+    country_mapping = build_country_mapping(europe_gdf)
     data_frames = []
 
     for path in data_paths:
         frame = pd.read_csv(path)
         frame = _normalize_frame_columns(frame)
+        frame = _add_source(frame, path)
 
-        country_mapping = {}
-        for _, row in europe_gdf.iterrows():
-            for value in [row.get('NAME_ENGL'), row.get('CNTR_ID'), row.get('ISO3_CODE'), row.get('ISO2_Code')]:
-                if pd.notna(value):
-                    country_mapping[str(value).strip()] = row['CNTR_ID']
-
-        frame['geo_key'] = frame['geo'].astype(str).map(country_mapping).fillna(frame['geo']).astype(str)
+        frame['geo_key'] = frame['geo'].map(_lookup(frame['geo'], country_mapping))
         data_frames.append(frame)
 
-    data = pd.concat(data_frames, ignore_index=True)
+    # Values in several releases are taken from the first file (current release)
+    data = merge_releases(data_frames, keys=['geo_key', 'TIME_PERIOD', 'nrg_bal'])
 
     if return_raw:
         return data, europe_gdf
@@ -97,13 +178,7 @@ def load_data(
     }, inplace=True)
 
     # Map energy types to more descriptive names
-    energy_type_map = {
-        'Renewable energy - overall': 'Renewable Energy Total',
-        'Renewable energy - electricity': 'Renewable Electricity',
-        'Renewable energy - heating and cooling': 'Renewable Heating and Cooling',
-        'Renewable energy - transport': 'Renewable Energy in Transport'
-    }
-    merged_data['Energy Type'] = merged_data['Energy Type'].replace(energy_type_map)
+    merged_data['Energy Type'] = merged_data['Energy Type'].replace(get_dataset('nrg_ind_ren').labels)
     
     # Drop unnecessary columns
     columns_to_drop = ['DATAFLOW', 'LAST UPDATE', 'freq', 'unit', 'OBS_FLAG', 'CONF_STATUS', 'geo', 'geo_key']
@@ -118,11 +193,106 @@ def load_data(
     
     # Add ISO2_Code for flag purposes (EL→GR), but keep Code as EL for plotting
     merged_data['ISO2_Code'] = merged_data['Code'].replace('EL', 'GR')
-    merged_data['Flag'] = merged_data['ISO2_Code'].apply(iso2_to_flag)
+    merged_data = add_country_flags(merged_data)
 
     # Define the final columns to return
     final_columns = [
-        'Code', 'Flag', 'Country', 'Energy Type', 'Renewable Percentage', 'Year',
+        'Code', 'Flag', 'Country', 'Energy Type', 'Renewable Percentage', 'Year', 'Source',
         'CNTR_ID', 'ISO2_Code', 'ISO3_CODE', 'geometry'
     ]
-    return merged_data[final_columns]
\ No newline at end of file
+    return merged_data[final_columns]
+
+def load_renewable_consumption(
+    data_path: Optional[str] = None,
+    siec: str = 'RA000'
+) -> pd.DataFrame:
+    '''
+    Function to load renewable energy consumption in gross final consumption (KTOE).
+    Parameters:
+    - data_path: Path to the Eurostat nrg_ind_rfce CSV file (default: current release from the registry).
+    - siec: Energy product code to keep (RA000 = renewables and biofuels total).
+    Returns:
+    - DataFrame with columns Code, Year and Renewable Consumption.
+    '''
+    data_path = str(data_path or get_dataset('nrg_ind_rfce').paths[0])
+    if not os.path.exists(data_path):
+        raise FileNotFoundError("Missing input data files.")
+
+    frame = pd.read_csv(data_path, usecols=['siec', 'geo', 'TIME_PERIOD', 'OBS_VALUE'])
+    frame = frame[frame['siec'] == siec]
+    frame = frame.rename(columns={
+        'geo': 'Code', 'TIME_PERIOD': 'Year', 'OBS_VALUE': 'Renewable Consumption'
+    })
+    frame['Year'] = pd.to_numeric(frame['Year'], errors='coerce')
+    return frame[['Code', 'Year', 'Renewable Consumption']].reset_index(drop=True)
+
+
+def load_indicator(spec: DatasetSpec, geo_df: pd.DataFrame) -> pd.DataFrame:
+    '''
+    Function to load all files of a registered indicator into one table.
+    Parameters:
+    - spec: Dataset specification from data/registry.py.
+    - geo_df: Boundaries of the dataset's geographic level, used to map names and codes.
+    Returns:
+    - DataFrame with columns Country (or Region), Code, <category_label>, Year, <value_label>.
+      Rows that exist in several files are taken from the first file (current release).
+      Aggregates without geometry (e.g. EU27_2020) are dropped.
+    '''
+    if not all(os.path.exists(path) for path in spec.paths):
+        raise FileNotFoundError(f"Missing input data files for {spec.key}.")
+
+    level = spec.geo
+    columns = {spec.dimension, *spec.column_aliases, 'geo', 'TIME_PERIOD', 'OBS_VALUE'}
+    geo_mapping = build_geo_mapping(geo_df, spec)
+    frames = []
+    for path in spec.paths:
+        frame = _normalize_frame_columns(pd.read_csv(path, usecols=lambda c: c in columns), spec)
+        frame['Code'] = frame['geo'].map(_lookup(frame['geo'], geo_mapping, default=pd.NA))
+        frames.append(frame.dropna(subset=['Code', 'TIME_PERIOD']))
+
+    data = merge_releases(frames, keys=['Code', 'TIME_PERIOD', spec.dimension])
+
+    # Names are looked up once per code and expanded with the category codes
+    codes = data['Code'].astype('category')
+    names = geo_df.set_index(level.id_column)[level.name_column].reindex(codes.cat.categories).to_numpy()
+    table = pd.DataFrame({
+        level.label: pd.Categorical(names[codes.cat.codes]),
+        'Code': codes,
+        spec.category_label: data[spec.dimension].replace(spec.labels).astype('category'),
+        'Year': data['TIME_PERIOD'].astype('int16'),
+        spec.value_label: pd.to_numeric(data['OBS_VALUE'], errors='coerce'),
+    })
+    table = table.sort_values([level.label, spec.category_label, 'Year'])
+    return table.reset_index(drop=True)
+
+
+@lru_cache(maxsize=2)
+def load_geo(geo_path: str = str(GEO_PATH), nuts_level: Optional[int] = None) -> gpd.GeoDataFrame:
+    """Load the geographic data once per server process (one entry per geographic level)."""
+    geo_df = gpd.read_file(geo_path)
+    # NUTS files may contain all levels, keep only the requested one
+    if nuts_level is not None and 'LEVL_CODE' in geo_df.columns:
+        geo_df = geo_df[geo_df['LEVL_CODE'] == nuts_level]
+    return geo_df
+
+
+def load_dataset(key: str) -> pd.DataFrame:
+    """Load a registered indicator by key (see data/registry.py)."""
+    spec = get_dataset(key)
+    nuts_level = 2 if spec.geo_level == 'nuts2' else None
+    return load_indicator(spec, load_geo(str(spec.geo.path), nuts_level))
+
+
+_dataset_cache = None
+_dataset_cache_lock = threading.Lock()
+
+
+def get_dataset_cache() -> DatasetCache:
+    """Return the lazily loading dataset cache shared by all sessions of the server process."""
+    global _dataset_cache
+    with _dataset_cache_lock:
+        if _dataset_cache is None:
+            _dataset_cache = DatasetCache(load_dataset)
+            # Evict idle datasets even when no new datasets are requested
+            pn.state.schedule_task('dataset_cache_evict_idle', _dataset_cache.evict_idle, period='10m')
+        return _dataset_cache
@@ -0,0 +1,83 @@
+# data/pipeline.py
+
+# Import necessary libraries
+import threading
+from typing import cast
+
+import pandas as pd
+import geopandas as gpd
+import panel as pn
+
+# Import data loading and preprocessing functions
+from data.loader import load_data, load_renewable_consumption
+from data.filters import preprocess, filter_data
+from data.analytics import precompute_analytics
+from data.registry import get_dataset
+from data.store import build_slice_store
+
+# GeoJSON path from the configuration
+from config import GEO_PATH
+
+# Set once the loading steps have been profiled in this server process
+_loading_profiled = threading.Event()
+_loading_profiled_lock = threading.Lock()
+
+
+def load_dashboard_data(profile=None) -> dict:
+    '''
+    Function to load, preprocess and precompute all data used by the dashboard.
+    Parameters:
+    - profile: Optional decorator applied to the loading steps (see utils/profiling.py).
+    Returns a dict with:
+    - df_renewable: Renewable energy total of the EU member states, with precomputed metrics
+    - df_eu_total: EU averages per year
+    - eu_avg_by_year: EU average indexed by year
+    - store: Per-year and per-country slices (see data/store.py)
+    '''
+    profile = profile or (lambda func: func)
+
+    # Load and preprocess data from paths relative to the project
+    raw_data, raw_europe = profile(load_data)(
+        data_path=[str(path) for path in get_dataset('nrg_ind_ren').paths], geo_path=str(GEO_PATH), return_raw=True
+    )
+    data = cast(pd.DataFrame, raw_data)
+    europe = cast(gpd.GeoDataFrame, raw_europe)
+    if not isinstance(data, pd.DataFrame) or not isinstance(europe, gpd.GeoDataFrame):
+        raise ValueError("load_data did not return expected DataFrame and GeoDataFrame")
+    merged = profile(preprocess)(data, europe)
+    df_renewable, df_eu_total = profile(filter_data)(merged)
+
+    # Precompute trends, ranks and target gaps for all countries and years
+    consumption = load_renewable_consumption()
+    df_renewable, df_eu_total = precompute_analytics(df_renewable, df_eu_total, consumption)
+
+    return {
+        'df_renewable': df_renewable,
+        'df_eu_total': df_eu_total,
+        'eu_avg_by_year': df_eu_total.set_index('Year')['Renewable Percentage'],
+        # Split the data into per-year and per-country slices once
+        'store': build_slice_store(df_renewable),
+    }
+
+
+def get_dashboard_data(profile=None) -> dict:
+    """
+    Return the dashboard data, loaded once per server process and shared by all sessions.
+
+    With a profile decorator, the loading steps are profiled once per server process:
+    if the data was already loaded without profiling (e.g. `?profile=1` on a later
+    session), it is loaded again under the profiler and the result is discarded.
+    """
+    def load():
+        if profile is not None:
+            _loading_profiled.set()
+        return load_dashboard_data(profile)
+
+    data = pn.state.as_cached('dashboard_data', load)
+    if profile is not None:
+        with _loading_profiled_lock:
+            reload = not _loading_profiled.is_set()
+            _loading_profiled.set()
+        if reload:
+            load_dashboard_data(profile)
+    return data
@@ -0,0 +1,273 @@
+# data/registry.py
+
+# Import necessary libraries
+
+# Standard libraries for the dataset specification and the cache
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+# Pandas for memory usage of cached DataFrames
+import pandas as pd
+
+# Data directory and cache budget
+from config import DATA_DIR, DATASET_CACHE_BUDGET_MB, GEO_PATH, NUTS2_GEO_PATH
+
+
+@dataclass(frozen=True)
+class GeoLevel:
+    '''
+    Geographic level of a dataset and the boundaries it is joined with.
+    - path: GeoJSON file with the boundaries
+    - id_column: Feature property holding the id used on the map (e.g. CNTR_ID or NUTS_ID)
+    - name_column: Feature property holding the display name
+    - label: Column name for the display names in the dashboard
+    '''
+    path: Path
+    id_column: str
+    name_column: str
+    label: str
+
+    @property
+    def available(self):
+        """True if the boundary file exists."""
+        return self.path.exists()
+
+
+GEO_LEVELS = {
+    'country': GeoLevel(GEO_PATH, 'CNTR_ID', 'NAME_ENGL', 'Country'),
+    'nuts2': GeoLevel(NUTS2_GEO_PATH, 'NUTS_ID', 'NAME_LATN', 'Region'),
+}
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    '''
+    Description of a Eurostat indicator.
+    - key: Eurostat dataset code
+    - title: Human-readable title
+    - files: CSV files in DATA_DIR, current release first
+    - unit: Unit of the values
+    - dimension: Column holding the category codes (e.g. 'nrg_bal' or 'siec')
+    - column_aliases: Other names of the dimension column in older export formats
+    - category_label: Column name for the categories in the dashboard
+    - value_label: Column name for the values in the dashboard
+    - codes: Category code -> Eurostat label (unmapped codes are kept as they are)
+    - labels: Eurostat label -> display name in the dashboard
+    - source: Eurostat data browser URL
+    - geo_level: Geographic level, a key of GEO_LEVELS ('country' or 'nuts2')
+    '''
+    key: str
+    title: str
+    files: Tuple[str, ...]
+    unit: str
+    dimension: str
+    category_label: str
+    value_label: str
+    column_aliases: Tuple[str, ...] = ()
+    codes: Dict[str, str] = field(default_factory=dict)
+    labels: Dict[str, str] = field(default_factory=dict)
+    source: str = ''
+    geo_level: str = 'country'
+
+    @property
+    def paths(self):
+        """Absolute paths of the dataset files, current release first."""
+        return [DATA_DIR / name for name in self.files]
+
+    @property
+    def geo(self) -> GeoLevel:
+        """Geographic level of the dataset."""
+        return GEO_LEVELS[self.geo_level]
+
+    @property
+    def available(self):
+        """True if the data files and the boundaries of the dataset exist."""
+        return self.geo.available and all(path.exists() for path in self.paths)
+
+
+DATASETS = {
+    'nrg_ind_ren': DatasetSpec(
+        key='nrg_ind_ren',
+        title='Share of energy from renewable sources',
+        files=('nrg_ind_ren_linear.csv', 'nrg_ind_ren_linear_old.csv'),
+        unit='%',
+        dimension='nrg_bal',
+        category_label='Energy Type',
+        value_label='Renewable Percentage',
+        # Some exports list the energy type as a fuel ('siec') column
+        column_aliases=('siec',),
+        codes={
+            'REN': 'Renewable energy - overall',
+            'R5110-5150_W6000RIS': 'Renewable energy - overall',
+            'REN_ELC': 'Renewable energy - electricity',
+            'REN_HEAT_CL': 'Renewable energy - heating and cooling',
+            'REN_TRA': 'Renewable energy - transport',
+        },
+        labels={
+            'Renewable energy - overall': 'Renewable Energy Total',
+            'Renewable energy - electricity': 'Renewable Electricity',
+            'Renewable energy - heating and cooling': 'Renewable Heating and Cooling',
+            'Renewable energy - transport': 'Renewable Energy in Transport',
+        },
+        source='https://ec.europa.eu/eurostat/databrowser/view/nrg_ind_ren/default/table?lang=en',
+    ),
+    'nrg_ind_rfce': DatasetSpec(
+        key='nrg_ind_rfce',
+        title='Contribution of renewable fuels to gross final consumption',
+        files=('nrg_ind_rfce_linear.csv', 'nrg_ind_rfce_linear_old.csv'),
+        unit='KTOE',
+        dimension='siec',
+        category_label='Fuel',
+        value_label='Consumption (KTOE)',
+        codes={
+            'RA000': 'Renewables and biofuels',
+            'RA100': 'Hydro',
+            'RA200': 'Tide, wave, ocean',
+            'RA300': 'Wind',
+            'RA310': 'Wind on shore',
+            'RA320': 'Wind off shore',
+            'RA410': 'Solar thermal',
+            'RA420': 'Solar photovoltaic',
+            'RA500': 'Geothermal',
+            'RA600': 'Ambient heat (heat pumps)',
+            'R5160': 'Charcoal',
+            'R5300': 'Biogases',
+            'W6210': 'Renewable municipal waste',
+        },
+        source='https://ec.europa.eu/eurostat/databrowser/view/nrg_ind_rfce/default/table?lang=en',
+    ),
+    # Regional indicator, requires geo/nuts2.geojson (not bundled)
+    'nrg_chdd_a': DatasetSpec(
+        key='nrg_chdd_a',
+        title='Heating and cooling degree days by NUTS-2 region',
+        files=('nrg_chdd_a_linear.csv',),
+        unit='degree days',
+        dimension='indic_nrg',
+        category_label='Indicator',
+        value_label='Degree Days',
+        codes={
+            'HDD': 'Heating degree days',
+            'CDD': 'Cooling degree days',
+        },
+        source='https://ec.europa.eu/eurostat/databrowser/view/nrg_chdd_a/default/table?lang=en',
+        geo_level='nuts2',
+    ),
+}
+
+
+def available_datasets(geo_level=None) -> Dict[str, DatasetSpec]:
+    """Return the registered datasets whose files exist, optionally only of one geographic level."""
+    return {
+        key: spec for key, spec in DATASETS.items()
+        if spec.available and (geo_level is None or spec.geo_level == geo_level)
+    }
+
+
+def get_dataset(key: str) -> DatasetSpec:
+    """Return the specification of a registered dataset."""
+    try:
+        return DATASETS[key]
+    except KeyError:
+        raise KeyError(f"Unknown dataset {key!r}. Available: {', '.join(DATASETS)}") from None
+
+
+class DatasetCache:
+    """
+    Loads datasets on first use and keeps them within a memory budget.
+
+    The least recently used datasets are evicted when the budget is exceeded
+    or when they have not been used for `max_idle` seconds. The budget covers
+    the datasets held by the cache: an evicted dataset stays in memory while a
+    session still shows it (e.g. in the Data Explorer table). Such a dataset is
+    taken back into the cache on the next request instead of being loaded a
+    second time.
+
+    Each dataset is loaded at most once at a time: concurrent requests for a
+    dataset that is being loaded wait for it.
+
+    Args:
+        loader (callable): Function loading a dataset by key and returning a DataFrame.
+        budget_mb (float): Memory budget in megabytes.
+        max_idle (float): Seconds after which an unused dataset is evicted (None = never).
+    """
+
+    def __init__(self, loader: Callable[[str], pd.DataFrame], budget_mb: float = DATASET_CACHE_BUDGET_MB,
+                 max_idle: float = 3600):
+        self.loader = loader
+        self.budget = budget_mb * 1024 ** 2
+        self.max_idle = max_idle
+        self._frames = OrderedDict()
+        # Evicted datasets, kept alive only by the sessions still using them
+        self._evicted = {}
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _size(frame: pd.DataFrame) -> int:
+        return int(frame.memory_usage(deep=True).sum())
+
+    def _touch(self, key: str) -> pd.DataFrame:
+        # Mark a cached dataset as most recently used (called with the lock held)
+        frame, size, _ = self._frames.pop(key)
+        self._frames[key] = (frame, size, time.monotonic())
+        return frame
+
+    def get(self, key: str) -> pd.DataFrame:
+        """Return a dataset, loading it if it is not cached."""
+        with self._lock:
+            self._evict_idle()
+            if key in self._frames:
+                return self._touch(key)
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # Loaded by another thread while waiting for the key lock
+                if key in self._frames:
+                    return self._touch(key)
+                ref = self._evicted.pop(key, None)
+            # Reuse an evicted dataset that sessions still hold, otherwise load it
+            frame = ref() if ref is not None else None
+            if frame is None:
+                frame = self.loader(key)
+            self.put(key, frame)
+        return frame
+
+    def put(self, key: str, frame: pd.DataFrame):
+        """Add an already loaded dataset to the cache."""
+        with self._lock:
+            self._frames.pop(key, None)
+            self._evicted.pop(key, None)
+            self._frames[key] = (frame, self._size(frame), time.monotonic())
+            # Evict the least recently used datasets, never the one just added
+            while self.memory_usage() > self.budget and len(self._frames) > 1:
+                self._evict(next(iter(self._frames)))
+
+    def _evict(self, key: str):
+        # Called with the lock held
+        frame, _, _ = self._frames.pop(key)
+        self._evicted[key] = weakref.ref(frame)
+
+    def _evict_idle(self):
+        if self.max_idle is None:
+            return
+        now = time.monotonic()
+        for key in [k for k, (_, _, used) in self._frames.items() if now - used > self.max_idle]:
+            self._evict(key)
+
+    def evict_idle(self):
+        """Evict the datasets that have not been used for `max_idle` seconds."""
+        with self._lock:
+            self._evict_idle()
+
+    def memory_usage(self) -> int:
+        """Return the memory used by the cached datasets in bytes."""
+        return sum(size for _, size, _ in self._frames.values())
+
+    def __contains__(self, key):
+        return key in self._frames
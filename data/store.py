@@ -0,0 +1,120 @@
+# data/store.py
+
+# Import necessary libraries
+import numpy as np
+import pandas as pd
+
+from utils.encoding import as_float32
+
+
+def build_slice_store(df_renewable: pd.DataFrame) -> dict:
+    '''
+    Function to split the data into per-year and per-country slices once.
+    The dashboard callbacks look slices up by key instead of filtering the
+    full DataFrame on every widget change.
+    Returns a dict with:
+    - by_year: {year: DataFrame of all countries in that year}
+    - by_country: {country: DataFrame of that country, sorted by year}
+    - arrays: {year: plot arrays of that year, see build_year_arrays}
+    - empty: empty DataFrame with the same columns, returned for unknown keys
+    '''
+    by_year = {int(year): frame for year, frame in df_renewable.groupby('Year', sort=True)}
+    by_country = {
+        country: frame.sort_values('Year')
+        for country, frame in df_renewable.groupby('Country', sort=True)
+    }
+    return {
+        'by_year': by_year,
+        'by_country': by_country,
+        'arrays': {year: build_year_arrays(frame) for year, frame in by_year.items()},
+        'empty': df_renewable.iloc[:0],
+    }
+
+
+def build_year_arrays(df_year: pd.DataFrame) -> dict:
+    '''
+    Function to prepare the arrays plotted for one year (map and bar chart).
+    The figure builders only pass these arrays on, so sorting, label lists and
+    the customdata block are computed once per year instead of per figure.
+    Returns a dict with:
+    - codes: country codes (map locations), in row order
+    - geo_codes: sorted tuple of the codes, used to select the boundaries
+    - shares: float32 renewable shares, in row order
+    - flags: flag emoji, in row order
+    - sources: provenance labels in row order, or None without a Source column
+    - year_sources: distinct provenance labels of the year (shown once per chart)
+    - ranked: the same values sorted by share (ascending) for the bar chart,
+      with countries, shares, flags, customdata (EU Rank, YoY Change) and
+      has_change (False if no country has a previous year, e.g. the first year)
+    '''
+    shares = as_float32(df_year['Renewable Percentage'])
+    flags = df_year['Flag'].tolist()
+    sources = df_year['Source'].astype(str).tolist() if 'Source' in df_year else None
+    # Stable sort, so countries with the same share keep their order
+    order = np.argsort(shares, kind='stable')
+    countries = df_year['Country'].to_numpy()[order]
+    customdata = as_float32(df_year.reindex(columns=['EU Rank', 'YoY Change']))[order]
+    return {
+        'codes': df_year['Code'].tolist(),
+        'geo_codes': tuple(sorted(df_year['Code'])),
+        'shares': shares,
+        'flags': flags,
+        'sources': sources,
+        'year_sources': sorted(set(sources)) if sources is not None else [],
+        'ranked': {
+            'countries': countries.tolist(),
+            'shares': shares[order],
+            'flags': [flags[i] for i in order],
+            'customdata': customdata,
+            'has_change': bool(np.isfinite(customdata[:, 1]).any()),
+        },
+    }
+
+
+def get_year_slice(store: dict, year: int) -> pd.DataFrame:
+    """Return the rows of all countries for a year."""
+    return store['by_year'].get(int(year), store['empty'])
+
+
+def get_country_slice(store: dict, country: str) -> pd.DataFrame:
+    """Return the rows of a country for all years."""
+    return store['by_country'].get(country, store['empty'])
+
+
+def get_year_arrays(store: dict, year: int) -> dict:
+    """Return the plot arrays of a year (built from the empty slice for unknown years)."""
+    arrays = store['arrays'].get(int(year))
+    if arrays is None:
+        arrays = build_year_arrays(store['empty'])
+    return arrays
+
+
+def build_region_matrix(table: pd.DataFrame, value_label: str, code_label: str = 'Code',
+                        name_label: str = 'Region') -> dict:
+    '''
+    Function to arrange a regional indicator as a dense year x region matrix.
+    The regional map sends the region geometry once and only swaps the values
+    of one matrix row when the year changes.
+    Returns a dict with:
+    - codes: region ids (map locations), in column order
+    - names: region names, in column order
+    - years: {year: row index}
+    - values: float32 array of shape (years, regions), NaN where no value exists
+    '''
+    matrix = table.pivot_table(index='Year', columns=code_label, values=value_label, aggfunc='first', observed=True)
+    codes = matrix.columns.astype(str)
+    names = table.drop_duplicates(code_label).set_index(code_label)[name_label]
+    return {
+        'codes': codes.tolist(),
+        'names': names.reindex(matrix.columns).astype(str).tolist(),
+        'years': {int(year): row for row, year in enumerate(matrix.index)},
+        'values': matrix.to_numpy(dtype=np.float32, na_value=np.nan),
+    }
+
+
+def get_region_values(matrix: dict, year: int):
+    """Return the values of all regions for a year (all NaN for unknown years)."""
+    row = matrix['years'].get(int(year))
+    if row is None:
+        return np.full(len(matrix['codes']), np.nan, dtype=np.float32)
+    return matrix['values'][row]
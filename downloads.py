@@ -0,0 +1,57 @@
+# downloads.py
+
+# Streaming download routes for the data explorer table.
+# Register them by serving the app with the plugin enabled:
+#
+#     panel serve app.py --plugins downloads
+
+# Import necessary libraries
+import json
+
+from tornado import web
+
+# Import the dataset cache shared with the dashboard sessions
+from data.loader import get_dataset_cache
+from data.registry import available_datasets
+from data.export import apply_filters, iter_csv_chunks, iter_parquet_chunks, parquet_available
+
+
+class DownloadHandler(web.RequestHandler):
+    """
+    Streams the (optionally filtered) table of a registered dataset as CSV or Parquet.
+
+    The `dataset` query argument selects the indicator (default: nrg_ind_ren), the `filters` query argument takes the JSON-encoded header filters of the
+    Tabulator widget. Rows are written and flushed chunk by chunk, so neither
+    the server nor the browser holds the complete file at once.
+    """
+
+    async def get(self, fmt):
+        dataset = self.get_argument('dataset', 'nrg_ind_ren')
+        if dataset not in available_datasets():
+            raise web.HTTPError(400, reason=f"Unknown dataset {dataset!r}.")
+        try:
+            filters = json.loads(self.get_argument('filters', '[]'))
+            table = apply_filters(get_dataset_cache().get(dataset), filters)
+        except ValueError as e:
+            raise web.HTTPError(400, reason=str(e))
+
+        if fmt == 'parquet':
+            if not parquet_available():
+                raise web.HTTPError(501, reason="Parquet export requires pyarrow.")
+            chunks = iter_parquet_chunks(table)
+            content_type = 'application/vnd.apache.parquet'
+        else:
+            chunks = iter_csv_chunks(table)
+            content_type = 'text/csv; charset=utf-8'
+
+        self.set_header('Content-Type', content_type)
+        self.set_header('Content-Disposition', f'attachment; filename="{dataset}.{fmt}"')
+        for chunk in chunks:
+            self.write(chunk)
+            await self.flush()
+
+
+# Routes picked up by `panel serve --plugins downloads`
+ROUTES = [
+    (r'/download/(csv|parquet)', DownloadHandler, {}),
+]
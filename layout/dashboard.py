@@ -1,11 +1,70 @@
 # layout/dashboard.py
 
+import base64
+from functools import lru_cache
+
 import panel as pn
 from panel.pane import Plotly
 from config import LOGO_PATH, PICTURE_PATH
 
+# Static parts of the dashboard
+#
+# The texts, the stylesheet and the images are the same for every session.
+# They are defined here once; Markdown is rendered to HTML and images are
+# encoded as data URIs once per server process instead of once per session.
+
+TITLE_MD = """
+# 🌱 Renewable Energy in the European Union: Explore developments across Europe
+"""
+
+DESCRIPTION_MD = """
+<div class="custom-desc">
+
+### 📑 Description
+This dashboard visualizes renewable energy data trends in the European Union, 
+allowing users to filter by year and country. Data is sourced from 
+[Eurostat](https://ec.europa.eu/eurostat/databrowser/view/nrg_ind_ren/default/table?lang=en&category=nrg.nrg_quant.nrg_quanta.nrg_ind_share).
+
+### ❓ How to Use
+Use the tabs to explore different aspects of the data.
+
+### 🌐 Project Page on GitHub
+[https://github.com/kuranez/EU-Energy-Map](https://github.com/kuranez/EU-Energy-Map)
+"""
+
+DESCRIPTION_CSS = """
+.custom-desc { font-size: 16px; }
+.custom-desc h3 { font-size: 1.05em; }
+"""
+
+
+class StaticMarkdown(pn.pane.Markdown):
+    """Markdown pane for fixed texts: each text is rendered to HTML once and shared by all sessions."""
+
+    _rendered = {}
+
+    def _transform_object(self, obj):
+        if obj not in self._rendered:
+            self._rendered[obj] = super()._transform_object(obj)
+        return self._rendered[obj]
+
 
-def build_layout(interactive_map, interactive_bar_year, interactive_bar_country, year_slider, country_select):
+@lru_cache(maxsize=None)
+def image_data_uri(path) -> str:
+    """Read an image once and return it as a base64 data URI."""
+    with open(path, 'rb') as f:
+        data = base64.b64encode(f.read()).decode('ascii')
+    return f"data:image/png;base64,{data}"
+
+
+@lru_cache(maxsize=None)
+def image_html(path, width, height) -> str:
+    """Return an <img> tag with the image embedded, built once per image and size."""
+    return f'<img src="{image_data_uri(path)}" width="{width}" height="{height}" alt="">'
+
+
+def build_layout(interactive_map, interactive_bar_year, interactive_bar_country, year_slider, country_select,
+                 comparison=None, data_explorer=None, static_map=None, regional=None):
     """
     Builds the complete Panel layout
 
@@ -15,42 +74,22 @@ def build_layout(interactive_map, interactive_bar_year, interactive_bar_country,
     - interactive_bar_country: Time series for country
     - year_slider: IntSlider widget
     - country_select: Select widget
+    - comparison: Optional country comparison panel, shown in its own tab
+    - data_explorer: Optional data table panel, shown in its own tab
+    - regional: Optional regional (NUTS-2) map panel, shown in its own tab
+    - static_map: Optional static map image, replaces the interactive map (e.g. for clients without WebGL)
 
     Returns:
     - FastListTemplate dashboard for display
     """
     # Markdown pane: title and short description
-    title_md = pn.pane.Markdown(
-        """
-        # 🌱 Renewable Energy in the European Union: Explore developments across Europe
-        """,
-    )
+    title_md = StaticMarkdown(TITLE_MD)
     # Markdown pane: information about the dashboard
-    description_md = pn.pane.Markdown(
-        """
-        <style>
-        .custom-desc { font-size: 16px; }
-        .custom-desc h3 { font-size: 1.05em; }
-        </style>
-        <div class="custom-desc">
-
-        ### 📑 Description
-        This dashboard visualizes renewable energy data trends in the European Union, 
-        allowing users to filter by year and country. Data is sourced from 
-        [Eurostat](https://ec.europa.eu/eurostat/databrowser/view/nrg_ind_ren/default/table?lang=en&category=nrg.nrg_quant.nrg_quanta.nrg_ind_share).
-        
-        ### ❓ How to Use
-        Use the tabs to explore different aspects of the data.
-
-        ### 🌐 Project Page on GitHub
-        [https://github.com/kuranez/EU-Energy-Map](https://github.com/kuranez/EU-Energy-Map) \
-        """,
-    )
-    # Picture pane for the description
-    description_png = pn.pane.PNG(
-        str(PICTURE_PATH),
+    description_md = StaticMarkdown(DESCRIPTION_MD, stylesheets=[DESCRIPTION_CSS])
+    # Picture pane for the description (embedded once per process)
+    description_png = pn.pane.HTML(
+        image_html(str(PICTURE_PATH), 250, 250),
         width=250, height=250,
-    
     )
     # Full description - Combines the markdown and picture panes
     description = pn.Row(
@@ -58,34 +97,53 @@ def build_layout(interactive_map, interactive_bar_year, interactive_bar_country,
         description_png,
     )
     # Tab structure for filters and charts
+    # Only the visible tab is rendered; the others are rendered when opened
     tabs = pn.Tabs(
         (
             'Year Filter',
             pn.Column(
                 year_slider,
-                Plotly(interactive_bar_year)
+                # Figures are copies of shared figures (see layout/session.py) and never changed in place, so they are not linked
+                Plotly(interactive_bar_year, link_figure=False)
             )
         ),
         (
             'Country Filter',
             pn.Column(
                 country_select,
-                Plotly(interactive_bar_country)
+                Plotly(interactive_bar_country, link_figure=False)
             )
-        )
+        ),
+        dynamic=True,
     )
+    # Country comparison tab (multi-select with line chart)
+    if comparison is not None:
+        tabs.append(('Compare Countries', comparison))
+    # Regional tab (NUTS-2 map), only when regional data is available
+    if regional is not None:
+        tabs.append(('Regions (NUTS-2)', regional))
+    # Data explorer tab (paginated table with downloads)
+    if data_explorer is not None:
+        tabs.append(('Data Explorer', data_explorer))
 
-    # Main Layout
-    layout = pn.Row(
-        # Plotly panel
-        Plotly(
+    # Map panel: interactive Plotly map or static image fallback
+    if static_map is not None:
+        map_panel = pn.panel(static_map, margin=(0, 20, 20, 0))
+    else:
+        map_panel = Plotly(
             # Plotly map pane
             interactive_map, 
+            link_figure=False,
             # Margins (top, right, bottom, left)
             margin=(0, 20, 20, 0),
             # Stretch vertically
              sizing_mode="stretch_height",
-             ),
+             )
+
+    # Main Layout
+    layout = pn.Row(
+        # Map panel
+        map_panel,
         # Info panel
         pn.Column(
             # Title pane
@@ -102,7 +160,8 @@ def build_layout(interactive_map, interactive_bar_year, interactive_bar_country,
     # Template for the dashboard
     template = pn.template.FastListTemplate(
         title="EU Energy Map",
-        logo=str(LOGO_PATH),
+        # Logo as data URI, so the file is not read and encoded for every session
+        logo=image_data_uri(str(LOGO_PATH)),
         theme="default",
         theme_toggle=False,
         sidebar=[],
@@ -0,0 +1,254 @@
+# layout/session.py
+
+# Per-session dashboard construction, shared figures and the session pool
+#
+# Each browser session gets its own widgets and layout, while data and the
+# map/chart figures are shared by all sessions of the server process. The
+# session pool builds complete dashboards in the background, so a new visitor
+# gets a ready dashboard instead of waiting for it to be built.
+
+# Import necessary libraries
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import panel as pn
+import plotly.graph_objects as go
+
+from data.loader import get_dataset_cache
+from data.store import get_year_slice, get_country_slice, get_year_arrays
+
+from components.widgets import create_widgets, create_comparison_widget
+from components.map import create_choropleth_map
+from components.charts.bar_chart_by_year import create_bar_chart_year
+from components.charts.bar_chart_by_country import create_bar_chart_country
+from components.charts.comparison_chart import create_comparison_chart, update_comparison_chart
+from components.table import create_data_explorer
+from components.regional import regional_available, create_regional_view
+from components.static_map import SnapshotCache, dataset_version
+
+from layout.dashboard import build_layout
+
+from config import SNAPSHOT_DIR, SESSION_POOL_SIZE
+
+# Year and country shown when the dashboard opens (see components/widgets.py)
+DEFAULT_YEAR = 2024
+DEFAULT_COUNTRY = 'Germany'
+# Panel settings of the session copied to dashboards built by the session pool
+POOL_SETTINGS = ('design', 'sizing_mode')
+
+
+class FigureCache:
+    """
+    Map and chart figures shared by all sessions, built on first use.
+
+    Every call returns a new copy of the cached figure: the Plotly pane moves
+    the numpy arrays out of nested trace properties (e.g. `marker.color`) when
+    it renders a figure, so the same figure object must not be rendered twice.
+    The map boundaries are not modified by the pane; they are kept out of the
+    cached figure and attached to each copy by reference, which keeps copying
+    cheap.
+
+    Args:
+        data (dict): Dashboard data returned by `get_dashboard_data`.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self._figures = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key, build):
+        cached = self._figures.get(key)
+        if cached is None:
+            figure = build()
+            # Keep the GeoJSON of map traces aside, see copy below
+            geojson = [trace.geojson if 'geojson' in trace else None for trace in figure.data]
+            for trace, trace_geojson in zip(figure.data, geojson):
+                if trace_geojson is not None:
+                    trace.geojson = None
+            with self._lock:
+                cached = self._figures.setdefault(key, (figure, geojson))
+        figure, geojson = cached
+        copy = go.Figure(figure)
+        for trace, trace_geojson in zip(copy.data, geojson):
+            if trace_geojson is not None:
+                trace.geojson = trace_geojson
+        return copy
+
+    def map(self, year):
+        """Return the choropleth map for a year."""
+        store = self.data['store']
+        return self._get(('map', int(year)), lambda: create_choropleth_map(
+            get_year_slice(store, year), arrays=get_year_arrays(store, year)
+        ))
+
+    def bar_by_year(self, year):
+        """Return the bar chart of all countries for a year."""
+        store = self.data['store']
+        return self._get(('bar_by_year', int(year)), lambda: create_bar_chart_year(
+            get_year_slice(store, year), year, eu_avg=self.data['eu_avg_by_year'].get(year),
+            arrays=get_year_arrays(store, year)
+        ))
+
+    def bar_by_country(self, country):
+        """Return the bar chart of a country for all years."""
+        return self._get(('bar_by_country', country), lambda: create_bar_chart_country(
+            self.data['df_eu_total'], get_country_slice(self.data['store'], country), country
+        ))
+
+    def warm(self, year=DEFAULT_YEAR, country=DEFAULT_COUNTRY):
+        """Build the figures shown when the dashboard opens."""
+        self.map(year)
+        self.bar_by_year(year)
+        self.bar_by_country(country)
+
+
+def get_figure_cache(data) -> FigureCache:
+    """Return the figure cache shared by all sessions, with the default figures built."""
+    def build():
+        figures = FigureCache(data)
+        figures.warm()
+        return figures
+    return pn.state.as_cached('figure_cache', build)
+
+
+def create_dashboard(data, figures, static_map=False, profile=None):
+    """
+    Create the widgets, callbacks and layout of one dashboard session.
+
+    Args:
+        data (dict): Dashboard data returned by `get_dashboard_data`.
+        figures (FigureCache): Shared map and chart figures.
+        static_map (bool): Show server-rendered map images instead of the interactive map.
+        profile (callable, optional): Decorator applied to the callbacks (see utils/profiling.py).
+
+    Returns:
+        FastListTemplate dashboard for display
+    """
+    profile = profile or (lambda func: func)
+    df_renewable, df_eu_total, store = data['df_renewable'], data['df_eu_total'], data['store']
+
+    # Widgets
+    year_slider, country_select = create_widgets(df_renewable)
+    comparison_select = create_comparison_widget(df_renewable)
+
+    # Bindings / interactive components
+    @pn.depends(year_slider.param.value)
+    @profile
+    def map_view(year):
+        return figures.map(year)
+
+    @pn.depends(year_slider.param.value)
+    @profile
+    def bar_by_year(year):
+        return figures.bar_by_year(year)
+
+    @pn.depends(country_select.param.value)
+    @profile
+    def bar_by_country(country):
+        return figures.bar_by_country(country)
+
+    if static_map:
+        # Static map snapshots, shared by all sessions
+        snapshots = pn.state.as_cached(
+            'map_snapshots', lambda version: SnapshotCache(store['by_year'], version, SNAPSHOT_DIR),
+            version=dataset_version(df_renewable)
+        )
+        # Render all years in the background on the first static map request
+        snapshots.warm()
+
+        @pn.depends(year_slider.param.value)
+        def map_snapshot(year):
+            return pn.pane.WebP(snapshots.get(year), sizing_mode='scale_width')
+    else:
+        map_snapshot = None
+
+    # Comparison chart is built per session; selection changes only toggle trace visibility
+    comparison_fig = create_comparison_chart(store['by_country'], df_eu_total, comparison_select.value)
+    comparison_select.param.watch(lambda event: update_comparison_chart(comparison_fig, event.new), 'value')
+    comparison_pane = pn.pane.Plotly(comparison_fig)
+
+    # Create the layout
+    return build_layout(
+        interactive_map=map_view,
+        interactive_bar_year=bar_by_year,
+        interactive_bar_country=bar_by_country,
+        year_slider=year_slider,
+        country_select=country_select,
+        comparison=pn.Column(comparison_select, comparison_pane),
+        data_explorer=create_data_explorer(get_dataset_cache()),
+        regional=create_regional_view(get_dataset_cache()) if regional_available() else None,
+        static_map=map_snapshot,
+    )
+
+
+class SessionPool:
+    """
+    Keeps a number of dashboards built in advance, ready to be handed to new sessions.
+
+    Each dashboard is used by exactly one session. After a dashboard is taken,
+    a replacement is built in a background thread. When the pool is empty
+    (e.g. during a burst of visitors), dashboards are built on demand.
+
+    Panel settings made with `pn.extension` (design, sizing mode) only apply to
+    the session that made them, and the background thread has no session. The
+    settings are therefore passed in and applied while a dashboard is built.
+
+    Args:
+        factory (callable): Function returning a new dashboard.
+        size (int): Number of dashboards kept ready (0 disables the pool).
+        settings (dict, optional): Panel config applied while building in the background.
+    """
+
+    def __init__(self, factory, size=SESSION_POOL_SIZE, settings=None):
+        self.factory = factory
+        self.size = size
+        self.settings = settings or {}
+        self._ready = deque()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='session-pool') if size else None
+
+    def _build(self):
+        try:
+            with pn.config.set(**self.settings):
+                dashboard = self.factory()
+            self._ready.append(dashboard)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def fill(self):
+        """Start building dashboards in the background until the pool is full."""
+        if not self.size:
+            return
+        with self._lock:
+            missing = self.size - len(self._ready) - self._pending
+            self._pending += max(missing, 0)
+        for _ in range(max(missing, 0)):
+            self._executor.submit(self._build)
+
+    def take(self):
+        """Return a dashboard built in advance, or a new one if none is ready."""
+        try:
+            dashboard = self._ready.popleft()
+        except IndexError:
+            dashboard = self.factory()
+        self.fill()
+        return dashboard
+
+    def __len__(self):
+        return len(self._ready)
+
+
+def get_session_pool(data) -> SessionPool:
+    """Return the session pool shared by the server process, filled on first use."""
+    def build():
+        figures = get_figure_cache(data)
+        # Use the settings of the session creating the pool (see app.py)
+        settings = {name: getattr(pn.config, name) for name in POOL_SETTINGS}
+        pool = SessionPool(lambda: create_dashboard(data, figures), settings=settings)
+        pool.fill()
+        return pool
+    return pn.state.as_cached('session_pool', build)
@@ -0,0 +1,54 @@
+# tests/test_analytics.py
+
+import pytest
+import pandas as pd
+from data.analytics import TARGET_2030, compute_country_metrics, compute_eu_metrics
+from components.charts.bar_chart_by_country import create_bar_chart_country
+
+
+@pytest.fixture
+def df_renewable():
+    return pd.DataFrame({
+        'Code': ['DE', 'DE', 'DE', 'SE', 'SE', 'SE'],
+        'Year': [2020, 2021, 2022, 2020, 2021, 2022],
+        'Renewable Percentage': [10.0, 12.0, 14.4, 60.0, 62.0, 66.0],
+    })
+
+
+def test_country_metrics(df_renewable):
+    df = compute_country_metrics(df_renewable)
+    de = df[df['Code'] == 'DE']
+    assert de['YoY Change'].tolist()[1:] == [2.0, 2.4]
+    assert pd.isna(de['YoY Change'].iloc[0])
+    assert de['CAGR'].iloc[-1] == pytest.approx(20.0)
+    assert de['Rolling Average'].iloc[-1] == pytest.approx(12.1)
+    assert de['EU Rank'].tolist() == [2, 2, 2]
+    assert de['Gap to EU 2030 Target'].iloc[-1] == pytest.approx(TARGET_2030 - 14.4)
+
+
+def test_eu_metrics_weighted_by_consumption(df_renewable):
+    df_eu_total = df_renewable.groupby('Year', as_index=False)['Renewable Percentage'].mean()
+    # DE: 10 KTOE renewable at 10% -> 100 KTOE gross final consumption
+    # SE: 60 KTOE renewable at 60% -> 100 KTOE gross final consumption
+    consumption = pd.DataFrame({
+        'Code': ['DE', 'SE'],
+        'Year': [2020, 2020],
+        'Renewable Consumption': [10.0, 60.0],
+    })
+    df = compute_eu_metrics(df_renewable, df_eu_total, consumption)
+    assert df.loc[df['Year'] == 2020, 'Weighted Percentage'].item() == pytest.approx(35.0)
+    assert df.loc[df['Year'] == 2021, 'Weighted Percentage'].isna().all()
+
+
+def test_country_chart_shows_metrics(df_renewable):
+    df = compute_country_metrics(df_renewable).assign(Country='Germany', Flag='🇩🇪')
+    df_eu_total = compute_eu_metrics(
+        df_renewable, df_renewable.groupby('Year', as_index=False)['Renewable Percentage'].mean(),
+        pd.DataFrame({'Code': ['DE', 'SE'], 'Year': [2020, 2020], 'Renewable Consumption': [10.0, 60.0]}),
+    )
+    fig = create_bar_chart_country(df_eu_total, df[df['Code'] == 'DE'], 'Germany')
+    eu, weighted, bars = fig.data
+    assert 'Gap to EU 2030 Target' in eu.hovertemplate
+    assert list(weighted.y) == [35.0]
+    assert bars.customdata.shape == (3, 2)
+    assert 'CAGR +20.0% per year' in fig.layout.title.text
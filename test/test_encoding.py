@@ -0,0 +1,50 @@
+# tests/test_encoding.py
+
+import pandas as pd
+import plotly.io as pio
+from components.map import create_choropleth_map
+from components.charts.bar_chart_by_year import create_bar_chart_year
+from utils.encoding import round_coordinates
+
+
+def _df_year():
+    return pd.DataFrame({
+        'Country': ['Germany', 'Sweden'],
+        'Code': ['DE', 'SE'],
+        'Flag': ['🇩🇪', '🇸🇪'],
+        'Year': [2022, 2022],
+        'Renewable Percentage': [20.8, 66.0],
+        'EU Rank': pd.array([2, 1], dtype='Int16'),
+        'YoY Change': [1.4, None],
+    })
+
+
+def test_bar_chart_year_uses_typed_arrays():
+    fig = create_bar_chart_year(_df_year(), 2022)
+    bar = pio.to_json(fig, validate=False)
+    assert fig.data[0].y.dtype == 'float32'
+    assert fig.data[0].customdata.dtype == 'float32'
+    assert '"bdata"' in bar
+
+
+def test_bar_chart_year_hides_change_without_previous_year():
+    assert 'Change to Previous Year' in create_bar_chart_year(_df_year(), 2022).data[0].hovertemplate
+    first_year = _df_year().assign(**{'YoY Change': [None, None]})
+    assert 'Change to Previous Year' not in create_bar_chart_year(first_year, 2022).data[0].hovertemplate
+
+
+def test_bar_chart_year_sends_source_once():
+    df_year = _df_year().assign(Source=pd.Categorical(['a.csv, 01/01/25'] * 2))
+    fig = create_bar_chart_year(df_year, 2022)
+    assert fig.data[0].hovertext is None
+    assert [a.text for a in fig.layout.annotations] == ['<i>Source: a.csv, 01/01/25</i>']
+
+
+def test_map_sends_only_shown_countries():
+    fig = create_choropleth_map(_df_year())
+    features = fig.data[0].geojson['features']
+    assert [f['properties']['CNTR_ID'] for f in features] == ['DE', 'SE']
+
+
+def test_round_coordinates():
+    assert round_coordinates([[[8.123456, 50.987654]]], 2) == [[[8.12, 50.99]]]
@@ -0,0 +1,48 @@
+# tests/test_export.py
+
+import io
+import pytest
+import pandas as pd
+from data.export import apply_filters, iter_csv_chunks, iter_parquet_chunks
+from components.table import header_filters
+
+
+@pytest.fixture
+def table_data():
+    # Same layout as the tables returned by `load_indicator`
+    return pd.DataFrame({
+        'Country': pd.Categorical(['France', 'Germany', 'Germany', 'Sweden']),
+        'Code': pd.Categorical(['FR', 'DE', 'DE', 'SE']),
+        'Energy Type': pd.Categorical(['Renewable Energy Total'] * 4),
+        'Year': pd.Series([2022, 2021, 2022, 2022], dtype='int16'),
+        'Renewable Percentage': [20.3, 19.4, 20.8, 66.0],
+    })
+
+
+def test_apply_filters_matches_tabulator_header_filters(table_data):
+    filters = [
+        {'field': 'Country', 'type': 'like', 'value': 'germ'},
+        {'field': 'Year', 'type': '=', 'value': '2022'},
+    ]
+    result = apply_filters(table_data, filters)
+    assert result['Renewable Percentage'].tolist() == [20.8]
+
+
+def test_header_filters_list_all_categories(table_data):
+    # The first page may only hold one category, so the values come from the whole table
+    filters = header_filters(table_data.head(1).assign(Fuel=pd.Categorical(['Wind'], categories=['Solar', 'Wind'])))
+    assert filters['Fuel']['values'] == ['Solar', 'Wind']
+    assert filters['Country']['func'] == 'like'
+
+
+def test_csv_chunks_roundtrip(table_data):
+    chunks = list(iter_csv_chunks(table_data, chunk_size=3))
+    assert len(chunks) == 3  # header + two chunks
+    result = pd.read_csv(io.BytesIO(b''.join(chunks)))
+    assert result['Year'].tolist() == table_data['Year'].tolist()
+
+
+def test_parquet_chunks_roundtrip(table_data):
+    pytest.importorskip('pyarrow')
+    result = pd.read_parquet(io.BytesIO(b''.join(iter_parquet_chunks(table_data, chunk_size=2))))
+    assert result['Renewable Percentage'].tolist() == table_data['Renewable Percentage'].tolist()
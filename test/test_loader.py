@@ -3,7 +3,9 @@
 import os
 import pytest
 import pandas as pd
-from data.loader import load_data, iso2_to_flag
+from data.loader import load_data, load_indicator, load_geo, merge_releases
+from utils.flags import iso2_to_flag
+from data.registry import get_dataset
 from data.filters import filter_data
 from components.charts.bar_chart_by_country import create_bar_chart_country
 
@@ -33,21 +35,55 @@ def test_load_data_includes_older_years_from_legacy_file(tmp_path):
 
     assert data['TIME_PERIOD'].min() == 2004
     assert data['nrg_bal'].eq('Renewable energy - overall').all()
+    assert data['Source'].eq('legacy.csv, x').all()
 
 
-def test_filter_data_deduplicates_country_year_rows():
+def test_load_data_reads_siec_exports(tmp_path):
+    siec_file = tmp_path / 'siec.csv'
+
+    pd.DataFrame([
+        {'LAST UPDATE': 'x', 'siec': 'R5110-5150_W6000RIS', 'geo': 'DE', 'TIME_PERIOD': 2020, 'OBS_VALUE': 19.1},
+        {'LAST UPDATE': 'x', 'siec': 'RA000', 'geo': 'DE', 'TIME_PERIOD': 2020, 'OBS_VALUE': 20.0},
+    ]).to_csv(siec_file, index=False)
+
+    data, _ = load_data(data_path=[str(siec_file)], geo_path='./geo/europe.geojson', return_raw=True)
+
+    # Both fuels are kept, the renewable total is mapped to the overall share
+    assert sorted(data['nrg_bal']) == ['RA000', 'Renewable energy - overall']
+
+
+def test_merge_releases_prefers_first_source_and_keeps_provenance():
+    current = pd.DataFrame({
+        'geo_key': ['DE', 'FR'], 'TIME_PERIOD': [2020, 2020], 'nrg_bal': ['REN', 'REN'],
+        'OBS_VALUE': [19.1, 19.3], 'Source': pd.Categorical(['current.csv, 13/05/26'] * 2),
+    })
+    legacy = pd.DataFrame({
+        'geo_key': ['DE', 'DE', 'DE'], 'TIME_PERIOD': [2004, 2020, 2020], 'nrg_bal': ['REN'] * 3,
+        'OBS_VALUE': [6.2, 19.0, 18.9], 'Source': pd.Categorical(['old.csv, 19/09/24'] * 3),
+    })
+
+    merged = merge_releases([current, legacy], keys=['geo_key', 'TIME_PERIOD', 'nrg_bal'])
+
+    assert len(merged) == 3
+    de_2020 = merged[(merged['geo_key'] == 'DE') & (merged['TIME_PERIOD'] == 2020)]
+    assert de_2020['OBS_VALUE'].tolist() == [19.1]
+    assert isinstance(merged['Source'].dtype, pd.CategoricalDtype)
+    assert merged.loc[merged['TIME_PERIOD'] == 2004, 'Source'].tolist() == ['old.csv, 19/09/24']
+
+
+def test_filter_data_keeps_one_row_per_country_year():
     merged = pd.DataFrame({
         'Country': ['Germany', 'Germany'],
         'Code': ['DE', 'DE'],
-        'Year': [2020, 2020],
-        'Renewable Percentage': [20.0, 20.0],
+        'Year': [2020, 2021],
+        'Renewable Percentage': [20.0, 19.2],
         'Energy Type': ['Renewable Energy Total', 'Renewable Energy Total'],
     })
 
     df_renewable, df_eu_total = filter_data(merged)
 
-    assert len(df_renewable) == 1
-    assert df_eu_total['Renewable Percentage'].tolist() == [20.0]
+    assert len(df_renewable) == 2
+    assert df_eu_total['Renewable Percentage'].tolist() == [20.0, 19.2]
 
 
 def test_country_chart_range_follows_available_years():
@@ -74,3 +110,13 @@ def test_country_chart_range_follows_available_years():
 def test_iso2_to_flag(iso2, flag):
     assert iso2_to_flag(iso2) == flag
 
+
+def test_load_indicator_prefers_current_release_and_drops_aggregates():
+    spec = get_dataset('nrg_ind_rfce')
+    table = load_indicator(spec, load_geo())
+
+    assert list(table.columns) == ['Country', 'Code', 'Fuel', 'Year', 'Consumption (KTOE)']
+    assert isinstance(table['Country'].dtype, pd.CategoricalDtype)
+    assert not table['Code'].astype(str).str.startswith('EU').any()
+    assert not table.duplicated(['Code', 'Fuel', 'Year']).any()
+    assert 'Renewables and biofuels' in set(table['Fuel'])
@@ -0,0 +1,51 @@
+# tests/test_profiling.py
+
+import time
+import panel as pn
+import data.pipeline as pipeline
+from utils.profiling import SamplingProfiler, make_profile_decorator
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+    return 'done'
+
+
+def test_profiler_writes_call_and_aggregate_files(tmp_path):
+    profiler = SamplingProfiler(tmp_path, interval=0.001, min_call_gap=0)
+    assert profiler.wrap(_busy)(0.05) == 'done'
+    call_files = [p for p in tmp_path.glob('_busy-*.folded')]
+    assert len(call_files) == 1
+    assert (tmp_path / 'flamegraph.folded').read_text().startswith('_busy;_busy (test_profiling.py')
+    assert (tmp_path / 'flamegraph.svg').read_text().startswith('<svg')
+
+
+def test_profiler_caps_calls_and_files(tmp_path):
+    profiler = SamplingProfiler(tmp_path, interval=0.001, min_call_gap=60, max_files=1)
+    busy = profiler.wrap(_busy)
+    busy(0.02)
+    busy(0.02)  # within min_call_gap, runs unprofiled
+    assert len(list(tmp_path.glob('_busy-*.folded'))) == 1
+
+
+def test_disabled_profiling_returns_function_unchanged():
+    assert make_profile_decorator(False)(_busy) is _busy
+
+
+def test_data_loading_is_profiled_once_when_already_cached(monkeypatch):
+    calls = []
+    monkeypatch.setattr(pipeline, 'load_dashboard_data', lambda profile=None: calls.append(profile) or {})
+    monkeypatch.setattr(pipeline, '_loading_profiled', pipeline.threading.Event())
+    pn.state.clear_caches()
+    try:
+        profile = make_profile_decorator(False)
+        # First session without profiling loads the data
+        pipeline.get_dashboard_data()
+        # A later profiled session loads it once more under the profiler
+        pipeline.get_dashboard_data(profile)
+        pipeline.get_dashboard_data(profile)
+        assert calls == [None, profile]
+    finally:
+        pn.state.clear_caches()
@@ -0,0 +1,65 @@
+# tests/test_regional.py
+
+import json
+from dataclasses import replace
+import numpy as np
+import pandas as pd
+import pytest
+from data.loader import load_indicator
+from data.registry import get_dataset
+from data.store import build_region_matrix, get_region_values
+from components.map import create_regional_map, update_regional_map
+
+
+def _square(lon, lat):
+    return [[[lon, lat], [lon + 1, lat], [lon + 1, lat + 1], [lon, lat + 1], [lon, lat]]]
+
+
+@pytest.fixture
+def regions(tmp_path):
+    features = [
+        {'type': 'Feature', 'properties': {'NUTS_ID': code, 'NAME_LATN': name, 'LEVL_CODE': 2},
+         'geometry': {'type': 'Polygon', 'coordinates': _square(lon, 50.0)}}
+        for code, name, lon in [('DE11', 'Stuttgart', 9.0), ('DE12', 'Karlsruhe', 8.0), ('FR10', 'Ile-de-France', 2.0)]
+    ]
+    path = tmp_path / 'nuts2.geojson'
+    path.write_text(json.dumps({'type': 'FeatureCollection', 'features': features}))
+    return path, pd.DataFrame([feature['properties'] for feature in features])
+
+
+@pytest.fixture
+def table(tmp_path, regions):
+    _, geo_df = regions
+    pd.DataFrame({
+        'LAST UPDATE': '01/01/25 23:00:00',
+        'indic_nrg': ['HDD', 'HDD', 'HDD', 'CDD', 'HDD'],
+        # Codes and names are both accepted, aggregates without geometry are dropped
+        'geo': ['DE11', 'Karlsruhe', 'DE11', 'DE11', 'DE'],
+        'TIME_PERIOD': [2023, 2023, 2024, 2024, 2024],
+        'OBS_VALUE': [3100.0, 2900.0, 3000.0, 40.0, 3050.0],
+    }).to_csv(tmp_path / 'regional.csv', index=False)
+    spec = replace(get_dataset('nrg_chdd_a'), files=(str(tmp_path / 'regional.csv'),))
+    return load_indicator(spec, geo_df)
+
+
+def test_load_indicator_joins_nuts_ids(table):
+    assert list(table.columns) == ['Region', 'Code', 'Indicator', 'Year', 'Degree Days']
+    assert set(table['Code']) == {'DE11', 'DE12'}
+    assert set(table['Region']) == {'Stuttgart', 'Karlsruhe'}
+
+
+def test_region_matrix_and_map_update(table, regions):
+    path, _ = regions
+    heating = table[table['Indicator'] == 'Heating degree days']
+    matrix = build_region_matrix(heating, 'Degree Days')
+
+    assert matrix['codes'] == ['DE11', 'DE12']
+    assert np.isnan(get_region_values(matrix, 2024)[1])
+    assert np.isnan(get_region_values(matrix, 1990)).all()
+
+    fig = create_regional_map(matrix, 2023, path, 'Heating degree days', 'degree days')
+    assert len(fig.data[0].geojson['features']) == 2
+    assert fig.data[0].text == ('Stuttgart', 'Karlsruhe')
+
+    update_regional_map(fig, matrix, 2024)
+    assert fig.data[0].z[0] == pytest.approx(3000.0)
@@ -0,0 +1,74 @@
+# tests/test_registry.py
+
+import threading
+import time
+import pytest
+import pandas as pd
+from data.registry import DatasetCache, get_dataset
+
+
+def _frame(rows):
+    return pd.DataFrame({'value': range(rows)}, dtype='int64')
+
+
+def test_get_dataset_unknown_key_lists_available():
+    with pytest.raises(KeyError, match='nrg_ind_ren'):
+        get_dataset('unknown')
+
+
+def test_dataset_cache_loads_lazily_once():
+    calls = []
+    cache = DatasetCache(lambda key: calls.append(key) or _frame(10), budget_mb=1)
+
+    assert 'a' not in cache
+    first = cache.get('a')
+    assert cache.get('a') is first
+    assert calls == ['a']
+
+
+def test_dataset_cache_evicts_least_recently_used_over_budget():
+    # Each frame is ~40 KB, the budget holds two of them
+    cache = DatasetCache(lambda key: _frame(5000), budget_mb=0.08)
+    cache.get('a')
+    cache.get('b')
+    cache.get('a')
+    cache.get('c')
+
+    assert 'a' in cache and 'c' in cache
+    assert 'b' not in cache
+    assert cache.memory_usage() <= cache.budget
+
+
+def test_dataset_cache_evicts_idle_datasets():
+    cache = DatasetCache(lambda key: _frame(10), max_idle=0)
+    cache.get('a')
+    cache.get('b')
+    assert 'a' not in cache
+
+
+def test_dataset_cache_reuses_evicted_datasets_still_in_use():
+    calls = []
+    cache = DatasetCache(lambda key: calls.append(key) or _frame(10), max_idle=0)
+    held = cache.get('a')  # e.g. shown in a session's table
+    cache.evict_idle()
+    assert 'a' not in cache
+    # Still held by a session: taken back instead of loading a second copy
+    assert cache.get('a') is held
+    assert calls == ['a']
+
+
+def test_dataset_cache_loads_each_dataset_once_concurrently():
+    calls = []
+
+    def slow_loader(key):
+        calls.append(key)
+        time.sleep(0.05)
+        return _frame(10)
+
+    cache = DatasetCache(slow_loader)
+    threads = [threading.Thread(target=cache.get, args=('a',)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == ['a']
@@ -0,0 +1,99 @@
+# tests/test_session.py
+
+import time
+import pytest
+import pandas as pd
+import panel as pn
+from bokeh.document import Document
+from panel.io.state import set_curdoc
+from data.store import build_slice_store
+from layout.session import FigureCache, SessionPool, POOL_SETTINGS
+from layout.dashboard import StaticMarkdown, image_data_uri
+from config import LOGO_PATH
+
+
+@pytest.fixture
+def figures():
+    df_renewable = pd.DataFrame({
+        'Country': ['Germany', 'France'],
+        'Code': ['DE', 'FR'],
+        'Flag': ['🇩🇪', '🇫🇷'],
+        'Year': [2024, 2024],
+        'Renewable Percentage': [22.0, 23.1],
+    })
+    df_eu_total = df_renewable.groupby('Year', as_index=False)['Renewable Percentage'].mean()
+    return FigureCache({
+        'df_eu_total': df_eu_total,
+        'eu_avg_by_year': df_eu_total.set_index('Year')['Renewable Percentage'],
+        'store': build_slice_store(df_renewable),
+    })
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_session_pool_hands_out_prebuilt_dashboards():
+    built = []
+    pool = SessionPool(lambda: built.append(len(built)) or len(built), size=2)
+    pool.fill()
+    assert _wait_for(lambda: len(pool) == 2)
+
+    first = pool.take()
+    assert first == 1
+    # The taken dashboard is replaced in the background
+    assert _wait_for(lambda: len(pool) == 2)
+    assert len(built) == 3
+
+
+def test_session_pool_disabled_builds_on_demand():
+    pool = SessionPool(lambda: object(), size=0)
+    pool.fill()
+    assert len(pool) == 0
+    assert pool.take() is not pool.take()
+
+
+def test_session_pool_uses_session_settings():
+    def build():
+        return pn.Column(pn.widgets.Select(options=['a']))
+
+    # Settings made by pn.extension in a session only apply to that session
+    with set_curdoc(Document()):
+        pn.extension(design='material', sizing_mode='stretch_width')
+        in_session = build()
+        settings = {name: getattr(pn.config, name) for name in POOL_SETTINGS}
+
+    pool = SessionPool(build, size=1, settings=settings)
+    pool.fill()
+    assert _wait_for(lambda: len(pool) == 1)
+    pooled = pool.take()
+    assert pooled[0].sizing_mode == in_session[0].sizing_mode == 'stretch_width'
+    assert pooled[0].design is in_session[0].design is not None
+
+
+def test_figure_cache_shares_figures(figures):
+    figures.warm()
+
+    # Each call returns a copy of the shared figure, with the same boundaries
+    assert figures.map(2024) is not figures.map(2024)
+    assert figures.map(2024).data[0].geojson is figures.map(2024).data[0].geojson
+    assert figures.bar_by_country('Germany') is not figures.bar_by_country('France')
+
+
+def test_figure_cache_figures_can_be_rendered_twice(figures):
+    for _ in range(2):
+        # Rendering moves the arrays out of the figure (see FigureCache)
+        model = pn.pane.Plotly(figures.bar_by_year(2024), link_figure=False).get_root()
+        assert 'marker.color' in model.data_sources[0].data
+        model = pn.pane.Plotly(figures.bar_by_country('Germany'), link_figure=False).get_root()
+        assert all('marker.color' in source.data for source in model.data_sources)
+
+
+def test_static_parts_are_built_once():
+    assert image_data_uri(str(LOGO_PATH)).startswith('data:image/png;base64,')
+    assert image_data_uri(str(LOGO_PATH)) is image_data_uri(str(LOGO_PATH))
+    first = StaticMarkdown('# Title')._transform_object('# Title')
+    assert StaticMarkdown('# Title')._transform_object('# Title') is first
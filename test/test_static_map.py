@@ -0,0 +1,51 @@
+# tests/test_static_map.py
+
+import pytest
+import pandas as pd
+import panel as pn
+from components.static_map import render_map_snapshot, dataset_version, SnapshotCache, use_static_map
+
+
+@pytest.fixture
+def df_year():
+    return pd.DataFrame({
+        'Code': ['DE', 'SE'],
+        'Year': [2022, 2022],
+        'Renewable Percentage': [20.8, 66.0],
+    })
+
+
+@pytest.mark.parametrize("fmt,magic", [
+    ("webp", b"RIFF"),
+    ("png", b"\x89PNG"),
+])
+def test_render_map_snapshot_formats(df_year, fmt, magic):
+    assert render_map_snapshot(df_year, fmt=fmt, size=(120, 100)).startswith(magic)
+
+
+def test_snapshot_cache_uses_disk_and_version(df_year, tmp_path):
+    version = dataset_version(df_year)
+    cache = SnapshotCache({2022: df_year}, version, tmp_path)
+    image = cache.get(2022)
+    assert (tmp_path / f"map_{version}_2022.webp").read_bytes() == image
+
+    # A new cache for the same version reads the file instead of rendering
+    assert SnapshotCache({}, version, tmp_path).get(2022) == image
+
+    changed = df_year.assign(**{'Renewable Percentage': [21.0, 66.0]})
+    assert dataset_version(changed) != version
+
+
+@pytest.mark.parametrize("args,headers,static", [
+    ({}, {}, False),
+    ({'static': [b'1']}, {}, True),
+    ({}, {'Save-Data': 'on'}, True),
+    # Header names as normalized by Tornado
+    ({}, {'Ect': '2g'}, True),
+    ({}, {'Ect': 'slow-2g'}, True),
+    ({}, {'Ect': '4g'}, False),
+])
+def test_use_static_map(monkeypatch, args, headers, static):
+    monkeypatch.setattr(type(pn.state), 'session_args', property(lambda self: args))
+    monkeypatch.setattr(type(pn.state), 'headers', property(lambda self: headers))
+    assert use_static_map() is static
@@ -0,0 +1,73 @@
+# tests/test_store.py
+
+import pytest
+import pandas as pd
+from data.store import build_slice_store, get_year_slice, get_country_slice, get_year_arrays
+from components.map import create_choropleth_map
+from components.charts.bar_chart_by_year import create_bar_chart_year
+from utils.flags import add_country_flags
+from utils.colors import get_qualitative_colors
+from components.charts.comparison_chart import create_comparison_chart, update_comparison_chart
+
+
+@pytest.fixture
+def df_renewable():
+    return pd.DataFrame({
+        'Country': ['Germany', 'France', 'Germany', 'France', 'Sweden'],
+        'Code': ['DE', 'FR', 'DE', 'FR', 'SE'],
+        'Flag': ['🇩🇪', '🇫🇷', '🇩🇪', '🇫🇷', '🇸🇪'],
+        'Year': [2022, 2021, 2021, 2022, 2022],
+        'Renewable Percentage': [20.8, 19.3, 19.4, 20.3, 66.0],
+    })
+
+
+def test_slice_store_lookups(df_renewable):
+    store = build_slice_store(df_renewable)
+    assert get_year_slice(store, 2022)['Code'].tolist() == ['DE', 'FR', 'SE']
+    assert get_country_slice(store, 'Germany')['Year'].tolist() == [2021, 2022]
+    assert get_year_slice(store, 1990).empty
+
+
+def test_qualitative_colors_cover_all_eu_countries():
+    assert len(set(get_qualitative_colors(27))) == 27
+
+
+def test_year_arrays_are_presorted(df_renewable):
+    store = build_slice_store(df_renewable)
+    arrays = get_year_arrays(store, 2022)
+    assert arrays['codes'] == ['DE', 'FR', 'SE']
+    assert arrays['geo_codes'] == ('DE', 'FR', 'SE')
+    ranked = arrays['ranked']
+    assert ranked['countries'] == ['France', 'Germany', 'Sweden']
+    assert ranked['flags'] == ['🇫🇷', '🇩🇪', '🇸🇪']
+    assert ranked['shares'].dtype == 'float32'
+    assert ranked['customdata'].shape == (3, 2)
+    assert get_year_arrays(store, 1990)['codes'] == []
+
+
+def test_figures_use_year_arrays(df_renewable):
+    store = build_slice_store(df_renewable)
+    arrays = get_year_arrays(store, 2022)
+    bar = create_bar_chart_year(None, 2022, eu_avg=35.7, arrays=arrays)
+    assert list(bar.data[0].x) == ['France', 'Germany', 'Sweden']
+    assert list(bar.data[0].text) == ['🇫🇷', '🇩🇪', '🇸🇪']
+    # Same figure as when built from the DataFrame
+    assert bar == create_bar_chart_year(get_year_slice(store, 2022), 2022, eu_avg=35.7)
+    fig = create_choropleth_map(None, arrays=arrays)
+    assert list(fig.data[0].locations) == ['DE', 'FR', 'SE']
+
+
+def test_add_country_flags():
+    data = pd.DataFrame({'ISO2_Code': ['DE', 'GR', 'DE', None]})
+    assert add_country_flags(data)['Flag'].tolist() == ['🇩🇪', '🇬🇷', '🇩🇪', '']
+
+
+def test_comparison_chart_toggles_visibility(df_renewable):
+    store = build_slice_store(df_renewable)
+    df_eu_total = df_renewable.groupby('Year', as_index=False)['Renewable Percentage'].mean()
+    fig = create_comparison_chart(store['by_country'], df_eu_total, ['Germany'])
+    assert len(fig.data) == 4  # EU average + one trace per country
+    assert [trace.visible for trace in fig.data] == [True, False, True, False]
+
+    update_comparison_chart(fig, ['France', 'Sweden'])
+    assert [trace.visible for trace in fig.data] == [True, True, False, True]
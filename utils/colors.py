@@ -7,6 +7,10 @@ import plotly.express as px
 
 VIRIDIS = px.colors.sequential.Viridis
 
+# Distinct colors for categorical traces (Alphabet has only 26 colors)
+
+QUALITATIVE = px.colors.qualitative.Alphabet + px.colors.qualitative.Dark24
+
 # Color conversion utilities
 
 def _tuple_to_hex(rgb_tuple):
@@ -59,4 +63,15 @@ def get_viridis_color(value: float, scale_max: float = 100.0, fmt: str = 'hex',
     elif fmt == 'rgba':
         return _hex_to_rgba(hex_color, alpha)
     else:
-        raise ValueError("fmt must be either 'hex' or 'rgba'")
\ No newline at end of file
+        raise ValueError("fmt must be either 'hex' or 'rgba'")
+
+# Distinct colors for categorical traces
+
+def get_qualitative_colors(n: int) -> list:
+    """
+    Return n distinct colors for categorical traces (e.g. one per country).
+    Uses the Plotly 'Alphabet' and 'Dark24' palettes (50 colors, enough for all
+    27 EU countries) and cycles them if more are requested.
+    """
+    palette = QUALITATIVE
+    return [palette[i % len(palette)] for i in range(n)]
@@ -0,0 +1,58 @@
+# utils/encoding.py
+
+from functools import lru_cache
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Compact array conversion for figure data
+#
+# Plotly serializes numpy arrays as base64 typed arrays ("bdata") and Panel
+# sends them as binary buffers, while pandas Series of Python objects end up
+# as JSON lists. Converting to small numeric dtypes keeps figure payloads small.
+
+def as_float32(values) -> np.ndarray:
+    """Convert values (e.g. percentages) to a float32 array, missing values become NaN."""
+    if hasattr(values, 'to_numpy'):
+        return values.to_numpy(dtype=np.float32, na_value=np.nan)
+    return np.asarray(values, dtype=np.float32)
+
+
+def as_int16(values) -> np.ndarray:
+    """Convert integer values (e.g. years) to an int16 array."""
+    if hasattr(values, 'to_numpy'):
+        return values.to_numpy(dtype=np.int16)
+    return np.asarray(values, dtype=np.int16)
+
+
+def round_coordinates(coordinates, precision: int = 3):
+    """
+    Round nested GeoJSON coordinate lists to the given number of decimals.
+    Three decimals (~100 m) are more than enough for the 1:20M boundaries.
+    """
+    first = coordinates[0] if coordinates else None
+    if isinstance(first, (list, tuple)) and first and isinstance(first[0], (list, tuple)):
+        return [round_coordinates(c, precision) for c in coordinates]
+    # Round a whole ring (or a single point) at once
+    return np.round(np.asarray(coordinates, dtype=float), precision).tolist()
+
+
+@lru_cache(maxsize=None)
+def compact_template(*trace_types: str) -> go.layout.Template:
+    """
+    Return the default Plotly template with trace defaults only for the given trace types.
+
+    The full template carries styling for every trace type (~7 KB per figure);
+    figures only need the layout part and the entries of the traces they use.
+    """
+    base = pio.templates['plotly']
+    return go.layout.Template(
+        layout=base.layout,
+        data={trace_type: base.data[trace_type] for trace_type in trace_types},
+    )
+
+
+def figure_payload_size(fig) -> int:
+    """Return the size in bytes of a figure serialized as JSON for the browser."""
+    return len(pio.to_json(fig, validate=False).encode('utf-8'))
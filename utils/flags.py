@@ -20,6 +20,9 @@ def iso2_to_flag(iso2_code: str) -> str:
 def add_country_flags(data):
     """
     Add country flags to the dataset using country codes.
+    The flag is computed once per distinct code and mapped onto the rows.
     """
-    data['Flag'] = data['ISO2_Code'].apply(iso2_to_flag)
-    return data
\ No newline at end of file
+    codes = data['ISO2_Code']
+    flags = {code: iso2_to_flag(code) for code in codes.unique()}
+    data['Flag'] = codes.map(flags)
+    return data
@@ -0,0 +1,232 @@
+# utils/profiling.py
+
+# Opt-in sampling profiler for dashboard callbacks
+#
+# Enable with the environment variable EU_ENERGY_MAP_PROFILE=1 (all sessions)
+# or the query parameter ?profile=1 (single session). Each profiled call writes
+# a folded-stack file, and all calls are aggregated into flamegraph.folded and
+# flamegraph.svg in PROFILE_DIR. Folded files can also be opened with
+# speedscope or flamegraph.pl.
+
+import functools
+import html
+import os
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+
+import panel as pn
+
+from config import PROFILE_DIR
+
+# Environment variable that enables profiling for all sessions
+PROFILE_ENV = 'EU_ENERGY_MAP_PROFILE'
+# Seconds between two stack samples
+SAMPLE_INTERVAL = 0.005
+# Minimum seconds between two profiled calls of the same function (caps overhead)
+MIN_CALL_GAP = 1.0
+# Maximum number of per-call profile files kept (oldest are removed)
+MAX_PROFILE_FILES = 200
+
+
+def profiling_enabled() -> bool:
+    """Return True if profiling is enabled by environment variable or query parameter."""
+    if os.environ.get(PROFILE_ENV, '').lower() in ('1', 'true', 'yes'):
+        return True
+    args = pn.state.session_args or {}
+    value = args.get('profile', [b''])[0]
+    if isinstance(value, bytes):
+        value = value.decode()
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of the calling thread while a profiled function runs.
+
+    Args:
+        directory (Path): Output directory for profile files.
+        interval (float): Seconds between two stack samples.
+        min_call_gap (float): Minimum seconds between two profiled calls of the same function;
+            calls in between run without profiling.
+        max_files (int): Maximum number of per-call profile files kept.
+    """
+
+    def __init__(self, directory, interval=SAMPLE_INTERVAL, min_call_gap=MIN_CALL_GAP,
+                 max_files=MAX_PROFILE_FILES):
+        self.directory = Path(directory)
+        self.interval = interval
+        self.min_call_gap = min_call_gap
+        self.max_files = max_files
+        self.totals = Counter()
+        self._last_call = {}
+        self._lock = threading.Lock()
+
+    def _should_profile(self, name) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_call.get(name, -self.min_call_gap) < self.min_call_gap:
+                return False
+            self._last_call[name] = now
+            return True
+
+    def _sample(self, thread_id, root_frame, name, stacks, stop):
+        while not stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            labels = []
+            # Walk up to the profiled function, skipping the server frames above it
+            while frame is not None and frame is not root_frame:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            # Skip samples taken after the profiled function has returned
+            if not stop.is_set():
+                stacks[';'.join([name, *reversed(labels)])] += 1
+
+    def wrap(self, func, name=None):
+        """Return a wrapper that profiles calls of func."""
+        name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self._should_profile(name):
+                return func(*args, **kwargs)
+            stacks = Counter()
+            stop = threading.Event()
+            sampler = threading.Thread(
+                target=self._sample,
+                args=(threading.get_ident(), sys._getframe(), name, stacks, stop),
+                daemon=True,
+            )
+            start = time.perf_counter()
+            sampler.start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stop.set()
+                sampler.join()
+                try:
+                    self._write(name, stacks, time.perf_counter() - start)
+                except OSError:
+                    # Profiling must never break the dashboard (e.g. disk full)
+                    pass
+
+        return wrapper
+
+    def _write(self, name, stacks, duration):
+        if not stacks:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        path = self.directory / f"{name}-{stamp}-{int(duration * 1000)}ms-{threading.get_ident()}.folded"
+        path.write_text(_folded(stacks))
+        with self._lock:
+            self.totals.update(stacks)
+            totals = Counter(self.totals)
+            self._remove_old_files()
+        (self.directory / 'flamegraph.folded').write_text(_folded(totals))
+        write_flamegraph_svg(self.directory / 'flamegraph.svg', totals)
+
+    def _remove_old_files(self):
+        files = sorted(
+            (p for p in self.directory.glob('*.folded') if p.name != 'flamegraph.folded'),
+            key=lambda p: p.stat().st_mtime,
+        )
+        for path in files[:max(len(files) - self.max_files, 0)]:
+            path.unlink(missing_ok=True)
+
+
+def _folded(stacks) -> str:
+    """Format stack counts in the folded format ('a;b;c count' per line)."""
+    return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def write_flamegraph_svg(path, stacks, width=1200, row_height=16):
+    """
+    Write a simple flame graph (SVG) of folded stack counts.
+
+    Args:
+        path (Path): Output file.
+        stacks (Counter): Folded stack -> sample count.
+        width (int): Image width in pixels.
+        row_height (int): Height of one stack level in pixels.
+    """
+    # Build a tree of {label: [count, children]} from the folded stacks
+    tree = {}
+    for stack, count in stacks.items():
+        level = tree
+        for label in stack.split(';'):
+            node = level.setdefault(label, [0, {}])
+            node[0] += count
+            level = node[1]
+
+    total = sum(node[0] for node in tree.values()) or 1
+    rects = []
+
+    def layout(level, x, depth):
+        for label, (count, children) in sorted(level.items()):
+            w = count / total * width
+            if w >= 0.5:
+                rects.append((x, depth, w, label, count))
+                layout(children, x, depth + 1)
+            x += w
+
+    layout(tree, 0.0, 0)
+    depth = max((r[1] for r in rects), default=0) + 1
+    height = depth * row_height
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="monospace" font-size="11">'
+    ]
+    for x, level, w, label, count in rects:
+        # Flame graphs grow upwards from the root
+        y = height - (level + 1) * row_height
+        hue = zlib.crc32(label.encode()) % 40 + 10
+        text = html.escape(label)
+        parts.append(
+            f'<g><title>{text} ({count} samples, {count / total:.1%})</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row_height - 1}" '
+            f'fill="hsl({hue},85%,60%)"/>'
+        )
+        max_chars = int(w // 7)
+        if max_chars > 3:
+            label_text = text if len(label) <= max_chars else html.escape(label[:max_chars - 2]) + '..'
+            parts.append(f'<text x="{x + 2:.1f}" y="{y + row_height - 4}">{label_text}</text>')
+        parts.append('</g>')
+    parts.append('</svg>')
+    Path(path).write_text('\n'.join(parts))
+
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> SamplingProfiler:
+    """Return the profiler shared by all sessions of the server process."""
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = SamplingProfiler(PROFILE_DIR)
+        return _profiler
+
+
+def make_profile_decorator(enabled):
+    """
+    Return a decorator that profiles a function if enabled, or leaves it unchanged.
+
+    Usage:
+        profile = make_profile_decorator(profiling_enabled())
+        merged = profile(preprocess)(data, europe)
+    """
+    if not enabled:
+        return lambda func: func
+    profiler = get_profiler()
+    return profiler.wrap